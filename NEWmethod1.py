@@ -1,19 +1,25 @@
 import os
 import io
-import tempfile
+import copy
+import html
 import json
-import re
 import math
-import pathlib
 from datetime import datetime
 from typing import List, Dict, Tuple, Optional
 
 import pandas as pd
 from docx import Document
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
+from docx.oxml import OxmlElement, parse_xml
+from docx.oxml.ns import nsdecls, qn
 from dotenv import load_dotenv
 import google.generativeai as genai
+from concurrent.futures import ThreadPoolExecutor
+
+# Optional: PyMuPDF lets us split the PDF and query Gemini page by page
+try:
+    import fitz  # type: ignore
+except Exception:
+    fitz = None
 
 # ----------------------
 # Configuration & Paths
@@ -24,6 +30,12 @@ WORD_TEMPLATE_FILE = "index2/format.docx"
 # Model name is hardcoded to match index2-word_converter.py
 GEMINI_MODEL_NAME = "models/gemini-2.5-pro"
 
+# Gemini rejects inline request payloads above ~20 MB; larger PDFs use the File API
+GEMINI_INLINE_LIMIT_BYTES = 18 * 1024 * 1024
+
+# Upper bound on concurrent per-page Gemini requests (API rate limits)
+GEMINI_MAX_CONCURRENCY = 8
+
 
 def load_api_key():
     """Load GOOGLE_API_KEY from .env and configure the Gemini client."""
@@ -74,32 +86,32 @@ def get_multipage_extraction_prompt():
     """
 
 
-def clean_and_convert_to_float(value, default=0.0):
-    if value is None:
-        return default
-    try:
-        cleaned_value = re.sub(r"[^0-9.]", "", str(value))
-        return float(cleaned_value) if cleaned_value else default
-    except (ValueError, TypeError):
-        return default
+def clean_and_convert_to_float(values: pd.Series, default=0.0) -> pd.Series:
+    """Vectorized numeric cleaning: strip everything but digits and dots, then
+    parse; missing or unparseable values become `default`."""
+    cleaned = values.where(values.notna(), "").astype(str).str.replace(r"[^0-9.]", "", regex=True)
+    return pd.to_numeric(cleaned, errors="coerce").fillna(default)
 
 
 # --- Helpers for Survey Number normalization ---
 
+# Western 0-9 and Devanagari ०-९
+_DIGITS = frozenset("0123456789" + "".join(chr(c) for c in range(0x0966, 0x0970)))
+_DIGIT_STRIP = str.maketrans("", "", "".join(_DIGITS))
+
+
 def _is_digit_char(c: str) -> bool:
-    return ("0" <= c <= "9") or ("\u0966" <= c <= "\u096F")
+    return c in _DIGITS
 
 
 def _is_numeric_token(token: str) -> bool:
     token = (token or "").strip()
-    if not token:
-        return False
-    return all(_is_digit_char(ch) for ch in token)
+    return bool(token) and not token.translate(_DIGIT_STRIP)
 
 
 def _starts_with_number(token: str) -> bool:
     token = (token or "").strip()
-    return bool(token) and _is_digit_char(token[0])
+    return bool(token) and token[0] in _DIGITS
 
 
 def normalize_survey_numbers(value) -> str:
@@ -136,8 +148,7 @@ def normalize_survey_numbers(value) -> str:
     return ", ".join(out)
 
 
-def add_table_borders(table):
-    tbl = table._element
+def _make_table_borders():
     tblBorders = OxmlElement('w:tblBorders')
     for border_name in ("top", "left", "bottom", "right", "insideH", "insideV"):
         border_el = OxmlElement(f"w:{border_name}")
@@ -146,41 +157,112 @@ def add_table_borders(table):
         border_el.set(qn("w:space"), "0")
         border_el.set(qn("w:color"), "000000")
         tblBorders.append(border_el)
-    tbl.tblPr.append(tblBorders)
+    return tblBorders
+
+
+# Identical for every table, so build it once and copy it per table
+_TBL_BORDERS_TEMPLATE = _make_table_borders()
+
+
+def add_table_borders(table):
+    table._element.tblPr.append(copy.deepcopy(_TBL_BORDERS_TEMPLATE))
+
+
+def _split_pdf_pages(pdf_bytes: bytes) -> List[bytes]:
+    """Split the PDF into single-page PDFs, dropping pages whose text layer marks
+    them as 'Payment Details'. Without PyMuPDF the whole PDF is returned as one part.
+    """
+    if fitz is None:
+        return [pdf_bytes]
+    pages = []
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as src:
+        for page in src:
+            if "Payment Details" in page.get_text():
+                continue
+            with fitz.open() as single:
+                single.insert_pdf(src, from_page=page.number, to_page=page.number)
+                pages.append(single.tobytes())
+    return pages
+
+
+def _extract_records(model, prompt: str, pdf_bytes: bytes) -> List[Dict]:
+    """Send one PDF part to Gemini and return the JSON array it extracts."""
+    if len(pdf_bytes) <= GEMINI_INLINE_LIMIT_BYTES:
+        # Small parts (single pages) go inline in the request, no upload round-trip
+        pdf_part = {"mime_type": "application/pdf", "data": pdf_bytes}
+    else:
+        pdf_part = genai.upload_file(io.BytesIO(pdf_bytes), mime_type="application/pdf", display_name="index2.pdf")
+    response = model.generate_content([prompt, pdf_part])
+    list_of_data = json.loads(response.text)
+    if not isinstance(list_of_data, list):
+        return []
+    return list_of_data
+
+
+def _fast_add_row(table, texts: List[str]):
+    """Append a row by parsing one <w:tr> string instead of going through
+    Table.add_row() and each cell's .text (which walks and rebuilds the paragraph
+    XML per cell). Like Table.add_row(): one cell per grid column, with the grid
+    column width. Each non-empty cell gets a single run whose text is set the way
+    cell.text sets it (tabs and line breaks become <w:tab/> and <w:br/>).
+    """
+    parts = [f"<w:tr {nsdecls('w')}>"]
+    for grid_col in table._tbl.tblGrid.gridCol_lst:
+        parts.append("<w:tc>")
+        if grid_col.w is not None:
+            parts.append(f'<w:tcPr><w:tcW w:w="{grid_col.w.twips}" w:type="dxa"/></w:tcPr>')
+        parts.append("<w:p/></w:tc>")
+    parts.append("</w:tr>")
+    tr = parse_xml("".join(parts))
+    for tc, text in zip(tr.findall(qn("w:tc")), texts):
+        if text:
+            r = OxmlElement("w:r")
+            r.text = str(text)
+            tc.find(qn("w:p")).append(r)
+    table._tbl.append(tr)
 
 
 def _records_from_pdf_bytes(pdf_bytes: bytes) -> List[Dict]:
     """Upload the uploaded PDF (bytes) to Gemini and get a list of records.
-    Mirrors process in index2-word_converter.py but works on uploaded file only.
+    Mirrors process in index2-word_converter.py but works on uploaded file only,
+    sending each page as its own concurrent request.
     """
     load_api_key()
-    model = genai.GenerativeModel(model_name=GEMINI_MODEL_NAME)
-
-    # Write to a NamedTemporaryFile so genai.upload_file can read it
-    with tempfile.NamedTemporaryFile(delete=True, suffix='.pdf') as tmp:
-        tmp.write(pdf_bytes)
-        tmp.flush()
-        pdf_path = pathlib.Path(tmp.name)
-        pdf_file = genai.upload_file(path=pdf_path, display_name=pdf_path.name)
-        prompt = get_multipage_extraction_prompt()
-        response = model.generate_content([prompt, pdf_file])
-        json_text = response.text.strip().replace("```json", "").replace("```", "")
-        list_of_data = json.loads(json_text)
-        if not isinstance(list_of_data, list):
-            return []
+    model = genai.GenerativeModel(
+        model_name=GEMINI_MODEL_NAME,
+        generation_config={"response_mime_type": "application/json"},
+    )
+    prompt = get_multipage_extraction_prompt()
+
+    # Fan out one request per relevant page; results keep page order
+    page_pdfs = _split_pdf_pages(pdf_bytes)
+    with ThreadPoolExecutor(max_workers=GEMINI_MAX_CONCURRENCY) as executor:
+        per_page = list(executor.map(lambda b: _extract_records(model, prompt, b), page_pdfs))
+    list_of_data = [data for page_data in per_page for data in page_data]
+
+    if not list_of_data:
+        return []
+
+    # Clean all numeric fields column-wise, then derive rates as column arithmetic
+    numeric = pd.DataFrame(list_of_data, columns=["area_sq_meter", "stamp_duty", "amount"])
+    numeric = numeric.apply(clean_and_convert_to_float)
+    has_area = numeric["area_sq_meter"] > 0
+    numeric["hectares"] = (numeric["area_sq_meter"] / 10000).where(has_area, 0.0)
+    numeric["rate_per_sqm"] = (numeric["stamp_duty"] / numeric["area_sq_meter"]).where(has_area, 0.0)
+    numeric["rate_per_guntha"] = numeric["rate_per_sqm"] * 100
+    numeric["rate_per_ha"] = numeric["rate_per_sqm"] * 10000
 
     all_records = []
-    for i, data in enumerate(list_of_data):
-        area_sqm = clean_and_convert_to_float(data.get("area_sq_meter"))
-        stamp_duty = clean_and_convert_to_float(data.get("stamp_duty"))
-        amount = clean_and_convert_to_float(data.get("amount"))
+    for i, (data, nums) in enumerate(zip(list_of_data, numeric.itertuples(index=False))):
+        area_sqm = nums.area_sq_meter
+        stamp_duty = nums.stamp_duty
+        amount = nums.amount
+        hectares = nums.hectares
+        rate_per_sqm = nums.rate_per_sqm
+        rate_per_guntha = nums.rate_per_guntha
+        rate_per_ha = nums.rate_per_ha
         survey_norm = normalize_survey_numbers(data.get("survey_number"))
 
-        hectares = area_sqm / 10000 if area_sqm > 0 else 0
-        rate_per_sqm = stamp_duty / area_sqm if area_sqm > 0 else 0
-        rate_per_guntha = rate_per_sqm * 100 if rate_per_sqm > 0 else 0
-        rate_per_ha = rate_per_sqm * 10000 if rate_per_sqm > 0 else 0
-
         processed_data = {
             "dast_kramank_year": data.get("dast_kramank_year", "N/A"),
             "sub_registrar_number": data.get("sub_registrar_number", "N/A"),
@@ -229,10 +311,7 @@ def _build_base_table_docx(doc: Document, records: List[Dict]) -> Tuple[List[str
             rec.get("prakar", "N/A"),              # 13 प्रकार
             rec.get("amount", "")                  # 14 Amount
         ]
-        cells = table.add_row().cells
-        for i, val in enumerate(values):
-            if i < len(cells):
-                cells[i].text = val
+        _fast_add_row(table, values)
         rows_for_html.append(values)
         serial_number += 1
 
@@ -246,22 +325,6 @@ def _build_base_table_docx(doc: Document, records: List[Dict]) -> Tuple[List[str
     return visual_header, rows_for_html
 
 
-def _to_float(s: str) -> float:
-    s_clean = re.sub(r"[^0-9.]", "", s or "")
-    try:
-        return float(s_clean) if s_clean else 0.0
-    except ValueError:
-        return 0.0
-
-
-def _date_in_range(s: str, start_dt: datetime, end_dt: datetime) -> bool:
-    try:
-        dt = datetime.strptime((s or '').strip(), "%d/%m/%Y")
-        return (dt >= start_dt) and (dt <= end_dt)
-    except Exception:
-        return False
-
-
 def _build_followup_tables(doc: Document, visual_header: List[str], all_rows: List[List[str]], start_dt: Optional[datetime] = None, end_dt: Optional[datetime] = None) -> Dict[str, List[List[str]]]:
     """Re-implements future_filter_and_aggregate() without input(), with temporary rules.
     Returns dict with keys: base_table, filtered_table, derived_table, top_table, and paragraphs list.
@@ -284,28 +347,22 @@ def _build_followup_tables(doc: Document, visual_header: List[str], all_rows: Li
     idx_prakar = 13
     idx_amount = 14
 
-    # Data rows start after first 3 rows: title, header, numbers row
-    data_rows = all_rows
+    # Base table rows as a frame with columns 0..idx_amount
+    df = pd.DataFrame(all_rows, columns=range(idx_amount + 1))
 
     # Filter by 'प्रकार' == 'बिनशेती जमिन'
-    filtered = [
-        r for r in data_rows
-        if len(r) > max(idx_prakar, idx_rate_sqm) and r[idx_prakar] == 'बिनशेती जमिन'
-    ]
+    mask = df[idx_prakar] == 'बिनशेती जमिन'
 
-    # Apply date range filter if provided by caller
+    # Apply date range filter if provided by caller; unparseable dates drop out
     if start_dt and end_dt:
-        filtered_in_range = []
-        for r in filtered:
-            if _date_in_range(r[idx_reg_date], start_dt, end_dt):
-                filtered_in_range.append(r)
-        filtered = filtered_in_range
-
-    # Sort by '(11) Rate per SqM' desc and keep top 50% (round up)
-    filtered.sort(key=lambda r: _to_float(r[idx_rate_sqm]), reverse=True)
-    n = len(filtered)
-    keep_n = max(1, math.ceil(n * 0.5)) if n > 0 else 0
-    top_half = filtered[:keep_n]
+        reg_dates = pd.to_datetime(df[idx_reg_date].astype(str).str.strip(), format="%d/%m/%Y", errors="coerce")
+        mask &= reg_dates.between(start_dt, end_dt)
+
+    # Sort by '(11) Rate per SqM' desc (stable, like list.sort)
+    filtered_df = df[mask]
+    rate_sqm = clean_and_convert_to_float(filtered_df[idx_rate_sqm])
+    filtered_df = filtered_df.loc[rate_sqm.sort_values(ascending=False, kind="stable").index]
+    filtered = filtered_df.values.tolist()
 
     # Insert a heading and a new table for filtered rows (Second table)
     doc.add_paragraph("बिनशेती जमिन - फिल्टर केलेले")
@@ -314,11 +371,12 @@ def _build_followup_tables(doc: Document, visual_header: List[str], all_rows: Li
     for c_idx, text in enumerate(visual_header):
         new_table.rows[0].cells[c_idx].text = text
 
-    # Rows already exclude SN 8 above
+    # Keep the rows as written so HTML rendering need not read the docx back
+    filtered_rows_out = [list(visual_header)]
     for r in filtered:
-        cells = new_table.add_row().cells
-        for c_idx, text in enumerate(r[:len(visual_header)]):
-            cells[c_idx].text = text
+        row_out = r[:len(visual_header)]
+        _fast_add_row(new_table, row_out)
+        filtered_rows_out.append(row_out)
     add_table_borders(new_table)
 
     # Build derived table with selected columns + computed 'दर प्रती चौ.मी.'
@@ -341,18 +399,18 @@ def _build_followup_tables(doc: Document, visual_header: List[str], all_rows: Li
     for c_idx, text in enumerate(derived_header):
         derived_table.rows[0].cells[c_idx].text = text
 
-    def compute_rate(row):
-        amt = _to_float(row[idx_amount]) if len(row) > idx_amount else 0.0
-        area = _to_float(row[idx_area_sqm]) if len(row) > idx_area_sqm else 0.0
-        return (amt / area) if area > 0 else 0.0
+    # New rate = Amount / Area(sq m), computed column-wise
+    amounts = clean_and_convert_to_float(filtered_df[idx_amount])
+    areas = clean_and_convert_to_float(filtered_df[idx_area_sqm])
+    rates = (amounts / areas).where(areas > 0, 0.0).tolist()
 
     derived_rows = []
-    for r in filtered:
-        rate = compute_rate(r)
-        values = [r[i] if i < len(r) else "" for i in derived_indices]
-        cells = derived_table.add_row().cells
-        for c_idx, text in enumerate(values + [f"{rate:.2f}"]):
-            cells[c_idx].text = text
+    derived_rows_out = [derived_header]
+    for r, rate in zip(filtered, rates):
+        values = [r[i] for i in derived_indices]
+        row_out = values + [f"{rate:.2f}"]
+        _fast_add_row(derived_table, row_out)
+        derived_rows_out.append(row_out)
         derived_rows.append((values, rate))
     add_table_borders(derived_table)
 
@@ -368,10 +426,11 @@ def _build_followup_tables(doc: Document, visual_header: List[str], all_rows: Li
     top_table.style = doc.tables[0].style
     for c_idx, text in enumerate(top_header):
         top_table.rows[0].cells[c_idx].text = text
+    top_rows_out = [top_header]
     for values, rate in top_half_rows:
-        cells = top_table.add_row().cells
-        for c_idx, text in enumerate(values + [f"{rate:.2f}"]):
-            cells[c_idx].text = text
+        row_out = values + [f"{rate:.2f}"]
+        _fast_add_row(top_table, row_out)
+        top_rows_out.append(row_out)
     add_table_borders(top_table)
 
     # Average
@@ -379,14 +438,10 @@ def _build_followup_tables(doc: Document, visual_header: List[str], all_rows: Li
     avg_paragraph = f"Average दर प्रती चौ.मी. = {avg_value:.2f}"
     doc.add_paragraph(avg_paragraph)
 
-    # Prepare structures for HTML rendering
-    def table_to_rows(t):
-        return [[cell.text for cell in row.cells] for row in t.rows]
-
     return {
-        "filtered_table": table_to_rows(new_table),
-        "derived_table": table_to_rows(derived_table),
-        "top_table": table_to_rows(top_table),
+        "filtered_table": filtered_rows_out,
+        "derived_table": derived_rows_out,
+        "top_table": top_rows_out,
         "avg_paragraph": avg_paragraph,
     }
 
@@ -398,12 +453,23 @@ def _render_tables_as_html(base_header: List[str], base_rows: List[List[str]], f
     def render_table(rows: List[List[str]]):
         if not rows:
             return ""
-        head_html = "<thead><tr>" + "".join(f"<th>{pd.isna(h) and '' or h}</th>" for h in rows[0]) + "</tr></thead>"
-        body_rows = rows[1:] if len(rows) > 1 else []
-        body_html = "<tbody>" + "".join(
-            "<tr>" + "".join(f"<td>{pd.isna(c) and '' or c}</td>" for c in r) + "</tr>" for r in body_rows
-        ) + "</tbody>"
-        return f"<table class=\"data\">{head_html}{body_html}</table>"
+        buf = io.StringIO()
+        buf.write("<table class=\"data\"><thead><tr>")
+        for h in rows[0]:
+            buf.write("<th>")
+            buf.write(html.escape('' if h is None or pd.isna(h) else str(h), quote=False))
+            buf.write("</th>")
+        buf.write("</tr></thead><tbody>")
+        for r in rows[1:]:
+            buf.write("<tr>")
+            for c in r:
+                buf.write("<td>")
+                # Missing values (JSON null from Gemini, NaN) render empty, as before
+                buf.write(html.escape('' if c is None or pd.isna(c) else str(c), quote=False))
+                buf.write("</td>")
+            buf.write("</tr>")
+        buf.write("</tbody></table>")
+        return buf.getvalue()
 
     # Build the base table (header + rows)
     base_rows_all = [base_header] + base_rows
@@ -425,12 +491,12 @@ def _render_tables_as_html(base_header: List[str], base_rows: List[List[str]], f
     return "\n".join(html_parts)
 
 
-def process_index2_pdf_to_html(pdf_bytes: bytes, base_date_str: Optional[str] = None) -> Tuple[str, Optional[str]]:
+def process_index2_pdf_to_html(pdf_bytes: bytes, base_date_str: Optional[str] = None) -> Tuple[str, Optional[bytes]]:
     """Public entry point used by Flask route.
     - Extract records with Gemini
     - Build python-docx document using template (for layout parity)
     - Reproduce the same tables into HTML for the frontend
-    - No CSV is written; Word is not saved to disk
+    - No CSV is written; the Word file is returned as in-memory bytes
     """
     # Extract records
     records = _records_from_pdf_bytes(pdf_bytes)
@@ -460,13 +526,13 @@ def process_index2_pdf_to_html(pdf_bytes: bytes, base_date_str: Optional[str] =
     # Render to HTML with current page styles
     html = _render_tables_as_html(base_header, base_rows, followup)
 
-    # Save DOCX to temp for download (requested by user)
-    tmp_path = None
+    # Serialize DOCX in memory for download (requested by user)
+    docx_bytes = None
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp_doc:
-            doc.save(tmp_doc.name)
-            tmp_path = tmp_doc.name
+        buf = io.BytesIO()
+        doc.save(buf)
+        docx_bytes = buf.getvalue()
     except Exception:
-        tmp_path = None
+        docx_bytes = None
 
-    return html, tmp_path
+    return html, docx_bytes
@@ -1,35 +1,57 @@
-# 3) Optional transliteration
-try:
-    from unidecode import unidecode  # type: ignore
-except Exception:
-    def unidecode(x: str) -> str:  # fallback no-op
-        return x
+import atexit
+import hashlib
+import json
+import os
 import re
+import sqlite3
+import threading
 import time
+import unicodedata
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from io import BytesIO
 import sys
 from typing import List, Tuple, Optional, Dict, Callable
 
-from docx import Document
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
+from lxml import etree
+from lxml import html as lhtml
 from urllib.parse import quote_plus
 
-"""Optional translation support"""
+"""Optional translation support
+Imported on first use: the docx parsing path needs none of them, and
+googletrans builds its Translator (and HTTP client) when instantiated.
+Playwright is likewise imported where the scraper uses it.
+"""
 # 1) Prefer deep_translator (synchronous)
-try:
-    from deep_translator import GoogleTranslator as _DeepGoogleTranslator  # type: ignore
-    _deep_translator_available = True
-except Exception:
-    _DeepGoogleTranslator = None
-    _deep_translator_available = False
+@lru_cache(maxsize=1)
+def _deep_translator_cls():
+    try:
+        from deep_translator import GoogleTranslator  # type: ignore
+        return GoogleTranslator
+    except Exception:
+        return None
+
 
 # 2) Fallback: googletrans (typically synchronous in 4.0.0rc1)
-try:
-    from googletrans import Translator as _GTTranslator  # type: ignore
-    _gt_translator = _GTTranslator()
-except Exception:
-    _gt_translator = None
+@lru_cache(maxsize=1)
+def _gt_translator():
+    try:
+        from googletrans import Translator  # type: ignore
+        return Translator()
+    except Exception:
+        return None
+
+
+# 3) Optional transliteration
+@lru_cache(maxsize=1)
+def _unidecode_fn() -> Callable[[str], str]:
+    try:
+        from unidecode import unidecode  # type: ignore
+        return unidecode
+    except Exception:
+        return lambda x: x  # fallback no-op
 
 # ----------------------
 # Helpers: parse admin fields and survey numbers from .docx
@@ -41,8 +63,98 @@ LABEL_VILLAGE = ("मौजे", "मौजे:")
 ALL_LABEL_TOKENS = ("मौजे", "मौजे:", "तालुका", "तालुका:", "जिल्हा", "जिल्हा:")
 TABLE_SURVEY_HEADER = "भूमापन क्रमांक / गट क्रमांक"
 
-# Simple in-memory cache for translations
-_translate_cache: Dict[str, str] = {}
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_BODY = _W_NS + "body"
+_W_P = _W_NS + "p"
+_W_R = _W_NS + "r"
+_W_T = _W_NS + "t"
+_W_TAB = _W_NS + "tab"
+_W_BR = _W_NS + "br"
+_W_CR = _W_NS + "cr"
+_W_TBL = _W_NS + "tbl"
+_W_TR = _W_NS + "tr"
+_W_TC = _W_NS + "tc"
+
+_RE_LEAD_DIGITS = re.compile(r"^(\d+)")
+# Empty segments ("123//A", "/123") are skipped, as the old split('/') did
+_RE_SURVEY = re.compile(r"^[\s/]*(\d+)[^/]*(?:/[\s/]*(?!\d)([A-Za-z\u0900-\u097F]+))?")
+_RE_LABEL_SPLIT = re.compile(r"[:：]")
+# Longest tokens first so "मौजे:" wins over "मौजे" at the same position
+_ALL_LABELS_RE = re.compile("|".join(map(re.escape, sorted(ALL_LABEL_TOKENS, key=len, reverse=True))))
+# First character of every label; a paragraph without any of them cannot contain a label
+_LABEL_LEAD_CHARS = tuple(sorted({tok[0] for tok in ALL_LABEL_TOKENS}))
+
+TRANSLATE_CACHE_PATH = os.path.expanduser(
+    os.environ.get("TRANSLATE_CACHE_PATH", "~/.cache/land-pricing/translate.sqlite")
+)
+TRANSLATE_CACHE_TTL_SECONDS = 30 * 24 * 3600
+
+
+class _TranslateCache:
+    """Translation cache persisted in SQLite (keyed by sha1 of 'src|tgt|text'),
+    with an in-memory dict in front of it. Entries older than the TTL are
+    swept when the cache is opened. If the database cannot be opened, it
+    degrades to the in-memory dict only.
+    """
+
+    def __init__(self, path: str, src: str = 'mr', tgt: str = 'en'):
+        self.src = src
+        self.tgt = tgt
+        self._mem: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._db = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "key TEXT PRIMARY KEY, src TEXT, tgt TEXT, text TEXT, translated TEXT, ts INTEGER)"
+            )
+            self._db.execute("DELETE FROM translations WHERE ts < ?", (int(time.time()) - TRANSLATE_CACHE_TTL_SECONDS,))
+            self._db.commit()
+        except Exception as e:
+            print(f"[Method2] Translation cache disabled (in-memory only): {e}")
+            self._db = None
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha1(f"{self.src}|{self.tgt}|{text}".encode('utf-8')).hexdigest()
+
+    def get(self, text: str) -> Optional[str]:
+        if text in self._mem:
+            return self._mem[text]
+        if self._db is None:
+            return None
+        with self._lock:
+            row = self._db.execute(
+                "SELECT translated FROM translations WHERE key = ?", (self._key(text),)
+            ).fetchone()
+        if row is None:
+            return None
+        self._mem[text] = row[0]
+        return row[0]
+
+    def put(self, text: str, translated: str, persist: bool = True) -> None:
+        self._mem[text] = translated
+        if self._db is None or not persist:
+            return
+        try:
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO translations (key, src, tgt, text, translated, ts) VALUES (?, ?, ?, ?, ?, ?)",
+                    (self._key(text), self.src, self.tgt, text, translated, int(time.time())),
+                )
+                self._db.commit()
+        except Exception:
+            pass
+
+
+_translate_cache = _TranslateCache(TRANSLATE_CACHE_PATH)
+
+
+def _norm_key(s: str) -> str:
+    """Canonical form of a name for translation and caching: NFC, no ZWNJ/ZWJ, trimmed."""
+    return unicodedata.normalize('NFC', s).replace('\u200c', '').replace('\u200d', '').strip()
+
 
 def _translate_to_en(name: Optional[str]) -> Optional[str]:
     """Translate arbitrary text to English using googletrans if available.
@@ -50,28 +162,31 @@ def _translate_to_en(name: Optional[str]) -> Optional[str]:
     """
     if not name:
         return name
-    t = name.strip()
+    t = _norm_key(name)
     if not t:
         return t
-    if t in _translate_cache:
-        return _translate_cache[t]
+    cached = _translate_cache.get(t)
+    if cached is not None:
+        return cached
     # Try deep_translator first (explicit Marathi source)
-    if _deep_translator_available:
+    deep_cls = _deep_translator_cls()
+    if deep_cls is not None:
         try:
-            out = _DeepGoogleTranslator(source='mr', target='en').translate(t)
+            out = deep_cls(source='mr', target='en').translate(t)
             out = (out or '').strip() or t
-            _translate_cache[t] = out
+            _translate_cache.put(t, out)
             print(f"[Method2] Translated district via deep_translator '{t}' -> '{out}'")
             return out
         except Exception:
             pass
 
     # Fallback to googletrans if available
-    if _gt_translator is not None:
+    gt = _gt_translator()
+    if gt is not None:
         try:
-            res = _gt_translator.translate(t, src='mr', dest='en')
+            res = gt.translate(t, src='mr', dest='en')
             out = (getattr(res, 'text', None) or '').strip() or t
-            _translate_cache[t] = out
+            _translate_cache.put(t, out)
             print(f"[Method2] Translated district via googletrans '{t}' -> '{out}'")
             return out
         except Exception:
@@ -79,22 +194,50 @@ def _translate_to_en(name: Optional[str]) -> Optional[str]:
 
     # Last resort: transliterate to ASCII as a heuristic English form
     try:
-        ascii_name = unidecode(t).strip()
+        ascii_name = _unidecode_fn()(t).strip()
         if ascii_name:
             print(f"[Method2] Transliteration fallback '{t}' -> '{ascii_name}'")
-            _translate_cache[t] = ascii_name
+            # Not persisted: a real translation should replace it on the next run
+            _translate_cache.put(t, ascii_name, persist=False)
             return ascii_name
     except Exception:
         pass
+    # Remember the miss for this process too, so the translators are not retried per call
+    _translate_cache.put(t, t, persist=False)
     return t
 
+def _translate_many_to_en(names: List[Optional[str]]) -> List[Optional[str]]:
+    """Translate several admin names with a single request.
+    Cache misses are joined one per line and sent in one deep_translator call
+    (its translate_batch issues one request per item), then split back. If the
+    line count does not round-trip, falls back to per-name _translate_to_en.
+    """
+    missing = []
+    for name in names:
+        t = _norm_key(name or '')
+        if t and _translate_cache.get(t) is None and t not in missing:
+            missing.append(t)
+    deep_cls = _deep_translator_cls() if len(missing) > 1 else None
+    if deep_cls is not None:
+        try:
+            out = deep_cls(source='mr', target='en').translate("\n".join(missing))
+            lines = [ln.strip() for ln in (out or '').split("\n")]
+            if len(lines) == len(missing):
+                for src, tr in zip(missing, lines):
+                    _translate_cache.put(src, tr or src)
+                print(f"[Method2] Batch-translated {len(missing)} names via deep_translator")
+        except Exception:
+            pass
+    return [_translate_to_en(name) for name in names]
+
+@lru_cache(maxsize=4096)
 def _clean_text(s: str) -> str:
     # Normalize whitespace (including non-breaking) and trim
     if not s:
         return ""
     s = s.replace("\u200c", "").replace("\u00a0", " ")
-    s = re.sub(r"\s+", " ", s)
-    return s.strip()
+    # split() with no argument collapses any whitespace run and trims in one C pass
+    return " ".join(s.split())
 
 
 def _truncate_at_next_label(text: str) -> str:
@@ -104,46 +247,105 @@ def _truncate_at_next_label(text: str) -> str:
     if not text:
         return text
     # Find earliest index of any label token in the remainder (excluding at position 0)
-    cut_idx = None
-    for tok in ALL_LABEL_TOKENS:
-        idx = text.find(tok)
-        if idx != -1 and idx != 0:
-            cut_idx = idx if cut_idx is None else min(cut_idx, idx)
-    if cut_idx is not None:
-        return _clean_text(text[:cut_idx])
+    m = _ALL_LABELS_RE.search(text, 1)
+    if m:
+        return _clean_text(text[:m.start()])
     return _clean_text(text)
 
 
-def _extract_field_from_paragraphs(doc: Document, labels: Tuple[str, ...]) -> Optional[str]:
-    for p in doc.paragraphs:
-        text = _clean_text(p.text)
-        for lbl in labels:
-            if lbl in text:
-                # Take part after label and colon if present
-                parts = re.split(r"[:：]", text, maxsplit=1)
-                if len(parts) == 2 and lbl in parts[0]:
-                    return _truncate_at_next_label(parts[1])
-                # Otherwise, take text after label token
-                idx = text.find(lbl)
-                remainder = text[idx + len(lbl):]
-                remainder = remainder.lstrip(':：').strip()
-                return _truncate_at_next_label(remainder)
+def _field_after_label(text: str, lbl: str, idx: int) -> str:
+    """Value following the label lbl found at text[idx]."""
+    # Common layout "लेबल: value": the first colon directly follows the label,
+    # so the split below would give exactly this slice
+    n = len(lbl)
+    if idx == 0 and text[n:n + 1] in (':', '：'):
+        return _truncate_at_next_label(text[n + 1:])
+    # Take part after label and colon if present
+    parts = _RE_LABEL_SPLIT.split(text, maxsplit=1)
+    if len(parts) == 2 and lbl in parts[0]:
+        return _truncate_at_next_label(parts[1])
+    # Otherwise, take text after label token
+    remainder = text[idx + len(lbl):]
+    remainder = remainder.lstrip(':：').strip()
+    return _truncate_at_next_label(remainder)
+
+
+def _extract_admin_fields(paragraph_texts) -> Dict[str, Optional[str]]:
+    """Extract district, taluka and village in a single pass over the paragraphs.
+    Each paragraph is scanned once with _ALL_LABELS_RE; the first paragraph
+    mentioning a label wins for that field.
+    """
+    fields: Dict[str, Optional[str]] = {LABEL_DISTRICT[0]: None, LABEL_TALUKA[0]: None, LABEL_VILLAGE[0]: None}
+    pending = len(fields)
+    for raw in paragraph_texts:
+        # Cheap rejection: single-character `in` checks run as a C memchr-style scan
+        if not raw or not any(ch in raw for ch in _LABEL_LEAD_CHARS):
+            continue
+        text = _clean_text(raw)
+        for m in _ALL_LABELS_RE.finditer(text):
+            lbl = m.group(0).rstrip(':')
+            if fields.get(lbl, '') is None:
+                fields[lbl] = _field_after_label(text, lbl, m.start())
+                pending -= 1
+        if not pending:
+            break
+    return fields
+
+
+def _p_text(p) -> str:
+    """Text of a <w:p>, like python-docx's paragraph.text (tabs and breaks kept)."""
+    out = []
+    for r in p.iter(_W_R):
+        for el in r:
+            if el.tag == _W_T:
+                out.append(el.text or "")
+            elif el.tag == _W_TAB:
+                out.append("\t")
+            elif el.tag in (_W_BR, _W_CR):
+                out.append("\n")
+    return "".join(out)
+
+
+def _tc_text(tc) -> str:
+    """Text of a <w:tc>, like python-docx's cell.text (paragraphs joined by newlines)."""
+    return "\n".join(_p_text(p) for p in tc.iterchildren(_W_P))
+
+
+def _fast_table_cells(tbl) -> List[List[str]]:
+    """Read a <w:tbl>'s cell texts straight from its <w:tr>/<w:tc> children."""
+    return [[_tc_text(tc) for tc in tr.iterchildren(_W_TC)] for tr in tbl.iterchildren(_W_TR)]
+
+
+def _find_column(header_row: List[str], header_text: str) -> Optional[int]:
+    header_text_norm = _clean_text(header_text)
+    for j, cell_text in enumerate(header_row):
+        if header_text_norm in _clean_text(cell_text):
+            return j
     return None
 
 
-def _find_table_column_index(doc: Document, header_text: str) -> Tuple[Optional[int], Optional[Document]]:
-    header_text_norm = _clean_text(header_text)
-    for tbl in doc.tables:
-        # Assume first row is header
-        if len(tbl.rows) == 0:
+def _iter_docx_body(file_bytes: bytes):
+    """Stream word/document.xml and yield ('p', text) and ('tbl', rows) for each
+    top-level paragraph and table, in document order (the same elements
+    python-docx exposes as doc.paragraphs and doc.tables).
+    """
+    with zipfile.ZipFile(BytesIO(file_bytes)) as z:
+        xml = z.read('word/document.xml')
+    for _, elem in etree.iterparse(BytesIO(xml), events=('end',), tag=(_W_P, _W_TBL)):
+        parent = elem.getparent()
+        # Paragraphs inside table cells are read with their table
+        if parent is None or parent.tag != _W_BODY:
             continue
-        hdr_cells = tbl.rows[0].cells
-        for j, cell in enumerate(hdr_cells):
-            if header_text_norm in _clean_text(cell.text):
-                return j, tbl
-    return None, None
+        if elem.tag == _W_P:
+            yield 'p', _p_text(elem)
+        else:
+            yield 'tbl', _fast_table_cells(elem)
+        elem.clear()
+        while elem.getprevious() is not None:
+            del parent[0]
 
 
+@lru_cache(maxsize=4096)
 def _consider_survey_number(raw: str) -> Optional[str]:
     # Examples:
     # 123 -> 123
@@ -155,47 +357,38 @@ def _consider_survey_number(raw: str) -> Optional[str]:
     txt = _clean_text(raw)
     if not txt:
         return None
-
-    def _emit_status(self, msg: str):
-        # Simple status hook for UI/console
-        try:
-            print(f"[Status] {msg}")
-        except Exception:
-            pass
-    # Keep only first 2 segments
-    parts = [p.strip() for p in txt.split('/') if p.strip()]
-    if not parts:
-        return None
-    # First must start with digits
-    m = re.match(r"^(\d+)", parts[0])
+    # Base number from the first '/' segment, plus the leading letters of the
+    # second segment (Latin or Devanagari) unless it starts with a digit
+    m = _RE_SURVEY.match(txt)
     if not m:
         return None
-    base_num = m.group(1)
-    if len(parts) == 1:
-        return base_num
-    second = parts[1]
-    # If second starts with a digit => ignore, just the base number
-    if re.match(r"^\d+", second):
-        return base_num
-    # If second starts with a letter (Latin or Devanagari) then append letters from it
-    m2 = re.match(r"^([A-Za-z\u0900-\u097F]+)", second)
-    if m2:
-        return base_num + m2.group(1)
-    return base_num
+    return m.group(1) + (m.group(2) or '')
 
 
 def extract_admin_and_surveys_from_docx(file_bytes: bytes) -> Tuple[Optional[str], Optional[str], Optional[str], List[str]]:
-    doc = Document(BytesIO(file_bytes))
+    paragraphs: List[str] = []
+    col_idx: Optional[int] = None
+    rows: List[List[str]] = []
+    for kind, payload in _iter_docx_body(file_bytes):
+        if kind == 'p':
+            paragraphs.append(payload)
+        elif col_idx is None and payload:
+            # Assume first row is header
+            col_idx = _find_column(payload[0], TABLE_SURVEY_HEADER)
+            if col_idx is not None:
+                rows = payload
+
+    fields = _extract_admin_fields(paragraphs)
+    district = fields[LABEL_DISTRICT[0]]
+    taluka = fields[LABEL_TALUKA[0]]
+    village = fields[LABEL_VILLAGE[0]]
 
-    district = _extract_field_from_paragraphs(doc, LABEL_DISTRICT)
-    taluka = _extract_field_from_paragraphs(doc, LABEL_TALUKA)
-    village = _extract_field_from_paragraphs(doc, LABEL_VILLAGE)
-
-    col_idx, table = _find_table_column_index(doc, TABLE_SURVEY_HEADER)
     surveys: List[str] = []
-    if col_idx is not None and table is not None:
-        for i in range(1, len(table.rows)):
-            cell_text = _clean_text(table.rows[i].cells[col_idx].text)
+    if col_idx is not None:
+        for row in rows[1:]:
+            if col_idx >= len(row):
+                continue
+            cell_text = _clean_text(row[col_idx])
             if cell_text:
                 considered = _consider_survey_number(cell_text)
                 if considered:
@@ -207,57 +400,303 @@ def extract_admin_and_surveys_from_docx(file_bytes: bytes) -> Tuple[Optional[str
 # Scraper for the IGR site using the new logic
 # ----------------------
 
+# Set METHOD2_HEADLESS=0 to watch the browser locally
+METHOD2_HEADLESS = os.environ.get("METHOD2_HEADLESS", "1") != "0"
+# Delay Playwright adds before every action; only useful when watching a headed run
+METHOD2_SLOW_MO_MS = int(os.environ.get("METHOD2_SLOW_MO_MS", "0"))
+# Wait for the ASP.NET postback a select/click triggers, then a short DOM settle
+POSTBACK_TIMEOUT_MS = 8000
+POSTBACK_SETTLE_SECONDS = 0.2
+# "http" drives the site's postbacks with httpx (falling back to the browser when the
+# page does not look as expected); "browser" always uses Playwright
+METHOD2_TRANSPORT = os.environ.get("METHOD2_TRANSPORT", "http").lower()
+HTTP_TIMEOUT_SECONDS = 30.0
+# Idle connections to the IGR host kept open between scrapes
+HTTP_KEEPALIVE_CONNECTIONS = 20
+HTTP_KEEPALIVE_EXPIRY_SECONDS = 60.0
+HTTP_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/124.0 Safari/537.36'
+)
+# How long a SubZones grid page reached over HTTP is reused for the same village;
+# kept under ASP.NET's default 20-minute session timeout
+HTTP_GRID_CACHE_TTL_SECONDS = 600
+HTTP_GRID_CACHE_MAX_SIZE = 32
+# The scraper only reads selects, one grid and a textarea; skip fetching the rest
+_BLOCKED_RESOURCE_TYPES = frozenset({'image', 'font', 'stylesheet', 'media'})
+BROWSER_POOL_MAX_SIZE = 2
+# Scrapes that may hold a browser at once; further ones wait for a free slot
+BROWSER_POOL_MAX_ACTIVE = int(os.environ.get("METHOD2_MAX_BROWSERS", "2"))
+BROWSER_POOL_IDLE_TIMEOUT_SECONDS = 600
+
+_CHROMIUM_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-extensions',
+    '--lang=en-IN'                     # 👈 force Chromium language
+]
+
+
+class _BrowserPool:
+    """Keeps Chromium running between scrapes so each run skips the launch.
+    Playwright's sync API is bound to the thread that started it, so idle
+    browsers are kept per thread. method2.py's IGRScraper uses this pool too.
+    At most max_size browsers are kept across all threads, and at most
+    max_active are handed out at once. A browser idle for longer than
+    idle_timeout, disconnected, or launched with other options is closed
+    and replaced on the next acquire.
+    """
+
+    def __init__(self, max_size: int = BROWSER_POOL_MAX_SIZE, idle_timeout: float = BROWSER_POOL_IDLE_TIMEOUT_SECONDS, max_active: int = BROWSER_POOL_MAX_ACTIVE):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._idle_count = 0
+        self._active = threading.BoundedSemaphore(max(1, max_active))
+
+    def acquire(self, headless: bool, slow_mo: int):
+        """Return (playwright, browser) for the current thread, launching if needed.
+        Blocks while max_active browsers are in use; pair with release()."""
+        self._active.acquire()
+        try:
+            return self._acquire(headless, slow_mo)
+        except Exception:
+            self._active.release()
+            raise
+
+    def _acquire(self, headless: bool, slow_mo: int):
+        entry = getattr(self._local, 'entry', None)
+        self._local.entry = None
+        if entry is not None:
+            with self._lock:
+                self._idle_count -= 1
+            playwright, browser, key, released_at = entry
+            fresh = time.monotonic() - released_at < self.idle_timeout
+            if key == (headless, slow_mo) and fresh and browser.is_connected():
+                print('[Method2] Reusing pooled browser')
+                return playwright, browser
+            self._close(playwright, browser)
+        from playwright.sync_api import sync_playwright
+
+        print('[Method2] Starting Playwright...')
+        playwright = sync_playwright().start()
+        try:
+            browser = playwright.chromium.launch(headless=headless, slow_mo=slow_mo, args=_CHROMIUM_ARGS)
+        except Exception:
+            playwright.stop()
+            raise
+        return playwright, browser
+
+    def release(self, playwright, browser, headless: bool, slow_mo: int, reusable: bool = True) -> None:
+        """Keep the browser for this thread's next scrape, or close it if the pool is full."""
+        try:
+            if reusable and browser.is_connected():
+                with self._lock:
+                    if self._idle_count < self.max_size:
+                        self._idle_count += 1
+                        self._local.entry = (playwright, browser, (headless, slow_mo), time.monotonic())
+                        return
+            self._close(playwright, browser)
+        finally:
+            self._active.release()
+
+    @staticmethod
+    def _close(playwright, browser) -> None:
+        try:
+            print('[Method2] Closing browser')
+            browser.close()
+        except Exception:
+            pass
+        finally:
+            try:
+                print('[Method2] Stopping Playwright')
+                playwright.stop()
+            except Exception:
+                pass
+
+
+_browser_pool = _BrowserPool()
+
+# Label text for each radio in a frame, resolved in one evaluate call:
+# label[for=id], then the next <label>, then the enclosing td/tr/parent text.
+_RADIO_LABELS_JS = """
+(radios) => radios.map(r => {
+    const text = el => ((el && el.innerText) || '').trim();
+    let t = r.id ? text(document.querySelector(`label[for="${CSS.escape(r.id)}"]`)) : '';
+    if (!t) {
+        t = text(document.evaluate('following::label[1]', r, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue);
+    }
+    if (!t) {
+        t = ((r.closest('td')?.innerText) || (r.closest('tr')?.innerText) || (r.parentElement?.innerText) || '').trim();
+    }
+    return t;
+})
+"""
+
+# Indexes (among input[type='radio'] in document order) of the first radio after
+# and the first radio before a <label> containing the text; -1 when missing
+_LABELLED_RADIO_JS = """
+(radios, labelText) => ['following', 'preceding'].map(axis => {
+    const xp = `//label[contains(normalize-space(.), '${labelText}')]/${axis}::input[@type='radio'][1]`;
+    const snap = document.evaluate(xp, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    return snap.snapshotLength ? radios.indexOf(snap.snapshotItem(0)) : -1;
+})
+"""
+
+# Check a radio without clicking it and report whether it stuck
+_FORCE_CHECK_JS = """
+el => {
+    el.checked = true;
+    el.dispatchEvent(new Event('change', {bubbles:true}));
+    el.dispatchEvent(new Event('click', {bubbles:true}));
+    return el.checked;
+}
+"""
+
+# Cells of every <tr> in a grid, aligned with the rows: [col1, col2, col3, hasSurveyNoLink],
+# or null for rows with fewer than 3 cells. Text is joined like BeautifulSoup's get_text(strip=True).
+_GRID_ROWS_JS = """
+table => {
+    const txt = el => {
+        const w = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+        let s = '', n;
+        while ((n = w.nextNode())) s += n.data.trim();
+        return s;
+    };
+    return [...table.querySelectorAll('tr')].map(tr => {
+        const tds = tr.querySelectorAll('td');
+        if (tds.length < 3) return null;
+        const first = txt(tds[0]);
+        return [first, txt(tds[1]), txt(tds[2]), !!tds[0].querySelector('a') && first.includes('SurveyNo')];
+    });
+}
+"""
+
+# Short signature of a grid (row count, current pager page, start of the first data row),
+# used to notice a page change without transferring the table's HTML
+_GRID_SIG_JS = """
+sel => {
+    const t = document.querySelector(sel);
+    if (!t) return '';
+    const r = t.rows;
+    const pager = t.querySelector('.cssPager span');
+    return r.length + ':' + ((pager && pager.innerText) || '') + ':' + ((r[1] && r[1].innerText) || '').slice(0, 80);
+}
+"""
+
+# Truthy (the new signature) once the grid's signature differs from prev
+_GRID_CHANGED_JS = (
+    "([sel, prev]) => { const s = (" + _GRID_SIG_JS.strip() + ")(sel); return s && s !== prev ? s : null; }"
+)
+
+# Value of the first <textarea> (scrolled into view), '' when there is none
+_TEXTAREA_VALUE_JS = """
+(() => {
+    const ta = document.querySelector('textarea');
+    if (!ta) return '';
+    ta.scrollIntoView({block: 'nearest'});
+    return ta.value || '';
+})()
+"""
+
+_CHECKED_RADIO_LABEL_JS = """
+() => {
+    const r = document.querySelector("input[type='radio']:checked");
+    if (!r) return null;
+    const lab = r.id ? document.querySelector(`label[for="${CSS.escape(r.id)}"]`) : null;
+    const t = ((lab && lab.innerText) || '').trim();
+    return t || (r.closest('label')?.innerText) || (r.parentElement?.innerText) || '';
+}
+"""
+
+# Links in the first cell of the grid's n-th row (counted like _GRID_ROWS_JS, over
+# every tr): the 'SurveyNo' ones, or any link when the cell has no such one
+_ROW_LINK_XPATH = (
+    "xpath=(.//tr)[{n}]/td[1]//a[contains(., 'SurveyNo')]"
+    " | (.//tr)[{n}]/td[1][not(.//a[contains(., 'SurveyNo')])]//a"
+)
+
+
+def _match_option(options: List[Tuple[str, str]], key: str) -> Optional[Tuple[str, str]]:
+    """(text, value) of the option whose text equals key ignoring case, else of the
+    first option whose text contains it; None when nothing matches."""
+    by_text: Dict[str, Tuple[str, str]] = {}
+    for text, value in options:
+        by_text.setdefault(text.lower(), (text, value))
+    key = key.lower()
+    hit = by_text.get(key)
+    if hit is None:
+        hit = next((opt for text_lower, opt in by_text.items() if key in text_lower), None)
+    return hit
+
+
 class IGRSubzoneScraper:
-    def __init__(self, headless: bool = False, progress_cb: Optional[Callable[[str], None]] = None):
+    def __init__(self, headless: bool = METHOD2_HEADLESS, progress_cb: Optional[Callable[[str], None]] = None, slow_mo: int = METHOD2_SLOW_MO_MS):
         self.headless = headless
         self.progress_cb = progress_cb
+        self.slow_mo = slow_mo
         self.playwright = None
         self.browser = None
+        self.context = None
         self.page = None
+        self._contexts_cache = None  # [page, *frames], reset when frames attach/detach
+        self._cdp = None  # raw CDP session on the page, for hot polling loops
         self.base_url = 'https://igreval.maharashtra.gov.in/eASR2.0/eASRCommon.aspx?hDistName='
-        self._last_survey_input = None  # (ctx, locator) of the survey input we filled
 
     def __enter__(self):
-        print('[Method2] Starting Playwright...')
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(
-            headless=self.headless,
-            slow_mo=200,
-            args=[
-                '--no-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-gpu',
-                '--disable-extensions',
-                '--lang=en-IN'                     # 👈 force Chromium language
-            ]
-        )
+        self.playwright, self.browser = _browser_pool.acquire(self.headless, self.slow_mo)
 
-        context = self.browser.new_context(
-            locale='en-IN',                        # 👈 navigator.language
-            extra_http_headers={
-                'Accept-Language': 'en-IN,en;q=0.9'  # 👈 server-side language
-            }
-        )
+        try:
+            # A fresh context per scrape, so no cookies or session state carry over
+            self.context = context = self.browser.new_context(
+                locale='en-IN',                        # 👈 navigator.language
+                extra_http_headers={
+                    'Accept-Language': 'en-IN,en;q=0.9'  # 👈 server-side language
+                }
+            )
+            context.route('**/*', self._route_static)
 
-        self.page = context.new_page()
+            self.page = context.new_page()
+            self.page.on('frameattached', self._invalidate_contexts)
+            self.page.on('framedetached', self._invalidate_contexts)
+            try:
+                self._cdp = context.new_cdp_session(self.page)
+            except Exception:
+                self._cdp = None
+        except Exception:
+            _browser_pool.release(self.playwright, self.browser, self.headless, self.slow_mo, reusable=False)
+            raise
 
         self.page.set_default_timeout(30000)
         return self
 
     def __exit__(self, exc_type, exc, tb):
+        reusable = True
         try:
-            if self.page:
-                print('[Method2] Closing page')
-                self.page.close()
+            if self.context:
+                print('[Method2] Closing context')
+                self.context.close()
+        except Exception:
+            reusable = False
         finally:
-            try:
-                if self.browser:
-                    print('[Method2] Closing browser')
-                    self.browser.close()
-            finally:
-                if self.playwright:
-                    print('[Method2] Stopping Playwright')
-                    self.playwright.stop()
+            self.page = None
+            self.context = None
+            self._contexts_cache = None
+            self._cdp = None
+            if self.browser:
+                _browser_pool.release(self.playwright, self.browser, self.headless, self.slow_mo, reusable=reusable)
+            self.browser = None
+            self.playwright = None
+
+    @staticmethod
+    def _route_static(route):
+        if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+            route.abort()
+        else:
+            route.continue_()
 
     def _emit_status(self, msg: str):
         """Emit lightweight status updates for UI/console."""
@@ -277,30 +716,101 @@ class IGRSubzoneScraper:
             pass
 
     # --- Utilities ---
+    def _contexts(self):
+        """The page followed by its frames, rebuilt only after a frame attaches or detaches."""
+        if self._contexts_cache is None:
+            self._contexts_cache = [self.page, *self.page.frames]
+        return self._contexts_cache
+
+    def _invalidate_contexts(self, _frame=None):
+        self._contexts_cache = None
+
     def _find_context_with_selector(self, selector: str, timeout: int = 30000):
         """Return page or first frame that contains the selector."""
         try:
             self.page.wait_for_selector(selector, timeout=timeout)
             return self.page
         except Exception:
-            for fr in self.page.frames:
+            pass
+        # Poll every frame together for up to 2s rather than waiting 2s on each in turn
+        deadline = time.monotonic() + 2.0
+        while True:
+            for fr in self._contexts()[1:]:
                 try:
-                    fr.wait_for_selector(selector, timeout=2000)
-                    return fr
+                    if fr.query_selector(selector) is not None:
+                        return fr
                 except Exception:
                     continue
-        return None
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(0.1)
+
+    def _eval_main(self, expression: str):
+        """Evaluate a JS expression in the main frame and return its value.
+        Goes straight through the CDP session's Runtime.evaluate when there is one
+        (no Playwright handle bookkeeping), otherwise page.evaluate.
+        """
+        if self._cdp is not None:
+            try:
+                res = self._cdp.send("Runtime.evaluate", {"expression": expression, "returnByValue": True})
+                if 'exceptionDetails' not in res:
+                    return res.get('result', {}).get('value')
+            except Exception:
+                pass
+        return self.page.evaluate(expression)
+
+    def _eval_on_grid(self, ctx, selector: str, fn_js: str):
+        """Call fn_js with the element matching selector in ctx. The main frame goes
+        through _eval_main; child frames keep the Playwright locator path."""
+        if ctx is self.page or ctx is self.page.main_frame:
+            return self._eval_main(f"({fn_js.strip()})(document.querySelector({json.dumps(selector)}))")
+        return ctx.locator(selector).evaluate(fn_js)
+
+    def _grid_signature(self, ctx, selector: str) -> str:
+        try:
+            return ctx.evaluate(_GRID_SIG_JS, selector) or ''
+        except Exception:
+            return ''
+
+    def _wait_grid_change(self, ctx, selector: str, prev_sig: str, timeout_ms: int) -> str:
+        """Wait (polling inside the browser) until the grid's signature differs from
+        prev_sig. Returns the new signature, or prev_sig on timeout."""
+        try:
+            handle = ctx.wait_for_function(_GRID_CHANGED_JS, arg=[selector, prev_sig], timeout=timeout_ms, polling=200)
+            return handle.json_value() or prev_sig
+        except Exception:
+            return prev_sig
+
+    def _postback(self, action: Callable[[], None], timeout_ms: int = POSTBACK_TIMEOUT_MS) -> None:
+        """Run action (a select/click that posts the ASP.NET form back) and wait for
+        the POST response to eASRCommon.aspx rather than sleeping a fixed time.
+        Errors from the action itself propagate; a postback that never comes is
+        tolerated, since not every control posts back.
+        """
+        acted = False
+        try:
+            with self.page.expect_response(
+                lambda r: 'eASRCommon.aspx' in r.url and r.request.method == 'POST',
+                timeout=timeout_ms,
+            ):
+                action()
+                acted = True
+        except Exception:
+            if not acted:
+                raise
+            print(f"[Method2] No postback response within {timeout_ms}ms; continuing")
+        # Let the UpdatePanel apply the response to the DOM
+        time.sleep(POSTBACK_SETTLE_SECONDS)
 
     def _select_dropdown_label(self, selector: str, label: str):
         ctx = self._find_context_with_selector(selector)
         if ctx is None:
             raise RuntimeError(f"Selector not found in any frame: {selector}")
         print(f"[Method2] Selecting option '{label}' on {selector}")
-        ctx.select_option(selector, label=label)
-        time.sleep(1.0)
+        self._postback(lambda: ctx.select_option(selector, label=label))
 
     def _click_by_text_any(self, text: str, exact: bool = True):
-        targets = [self.page] + [f for f in self.page.frames]
+        targets = self._contexts()
         for ctx in targets:
             try:
                 loc = ctx.get_by_text(text, exact=exact)
@@ -313,26 +823,15 @@ class IGRSubzoneScraper:
         return False
 
     def _log_checked_radio(self, prefix: str = ""):
-        targets = [self.page] + [f for f in self.page.frames]
+        targets = self._contexts()
         for ctx in targets:
             try:
-                checked = ctx.locator("input[type='radio']:checked")
-                if checked.count() > 0:
-                    try:
-                        rid = checked.first.get_attribute('id')
-                        label = ''
-                        if rid:
-                            lab = ctx.locator(f"label[for='{rid}']")
-                            if lab.count() > 0:
-                                label = lab.first.inner_text().strip()
-                        if not label:
-                            label = checked.first.evaluate("el => (el.closest('label')?.innerText) || (el.parentElement?.innerText) || '' ") or ''
-                        print(f"[Method2] {prefix}Checked radio label: '{label}'")
-                        return
-                    except Exception:
-                        pass
+                label = ctx.evaluate(_CHECKED_RADIO_LABEL_JS)
             except Exception:
                 continue
+            if label is not None:
+                print(f"[Method2] {prefix}Checked radio label: '{label}'")
+                return
 
     def _select_radio_option(self, option_label: str) -> bool:
         """Select a radio option by its visible label text.
@@ -368,308 +867,64 @@ class IGRSubzoneScraper:
         """Force select the radio associated with a visible label (without relying on click).
         Finds a label that contains option_label, then checks the nearest radio input using JS.
         """
-        targets = [self.page] + [f for f in self.page.frames]
+        targets = self._contexts()
         for ctx in targets:
             try:
-                lab = ctx.locator(f"//label[contains(normalize-space(.), '{option_label}')]")
-                if lab.count() == 0:
-                    continue
-                # Prefer following radio then preceding
-                for xpath in [
-                    f"//label[contains(normalize-space(.), '{option_label}')]/following::input[@type='radio'][1]",
-                    f"//label[contains(normalize-space(.), '{option_label}')]/preceding::input[@type='radio'][1]",
-                ]:
-                    radio = ctx.locator(xpath)
-                    if radio.count() > 0:
-                        try:
-                            radio.first.evaluate("el => { el.checked = true; el.dispatchEvent(new Event('change', {bubbles:true})); el.dispatchEvent(new Event('click', {bubbles:true})); }")
-                            # Verify
-                            try:
-                                if radio.first.is_checked():
-                                    return True
-                            except Exception:
-                                return True
-                        except Exception:
-                            continue
+                radio_idx = ctx.eval_on_selector_all("input[type='radio']", _LABELLED_RADIO_JS, option_label)
             except Exception:
                 continue
+            radios = ctx.locator("input[type='radio']")
+            # Prefer following radio then preceding
+            for i in radio_idx:
+                if i < 0:
+                    continue
+                try:
+                    if radios.nth(i).evaluate(_FORCE_CHECK_JS):
+                        return True
+                except Exception:
+                    continue
         return False
 
     def _click_radio_by_label(self, label_text: str) -> bool:
         """Try to click a radio button associated with the given label text."""
-        targets = [self.page] + [f for f in self.page.frames]
+        targets = self._contexts()
         for ctx in targets:
             try:
-                # Try label then click the nearest preceding/following radio
-                lab = ctx.locator(f"//label[contains(normalize-space(.), '{label_text}')]")
-                if lab.count() > 0:
-                    # Following input
-                    try:
-                        radio = ctx.locator(f"//label[contains(normalize-space(.), '{label_text}')]/following::input[@type='radio'][1]")
-                        if radio.count() > 0:
-                            radio.first.click()
-                            return True
-                    except Exception:
-                        pass
-                    # Preceding input
-                    try:
-                        radio = ctx.locator(f"//label[contains(normalize-space(.), '{label_text}')]/preceding::input[@type='radio'][1]")
-                        if radio.count() > 0:
-                            radio.first.click()
-                            return True
-                    except Exception:
-                        pass
+                # Following then preceding radio of the label, located in one call
+                radio_idx = ctx.eval_on_selector_all("input[type='radio']", _LABELLED_RADIO_JS, label_text)
             except Exception:
                 continue
+            radios = ctx.locator("input[type='radio']")
+            for i in radio_idx:
+                if i < 0:
+                    continue
+                try:
+                    radios.nth(i).click()
+                    return True
+                except Exception:
+                    continue
         return False
 
     def _scan_radios_and_click(self, keywords: List[str]) -> bool:
         """Scan all radio inputs on page/frames and click the one whose associated label or nearby text contains any keyword."""
         keys = [k.strip().lower() for k in keywords if k and k.strip()]
-        targets = [self.page] + [f for f in self.page.frames]
+        targets = self._contexts()
         for ctx in targets:
             try:
-                radios = ctx.locator("input[type='radio']")
-                count = radios.count()
-                for i in range(count):
-                    r = radios.nth(i)
-                    label_text = ''
-                    try:
-                        rid = r.get_attribute('id')
-                        if rid:
-                            lab = ctx.locator(f"label[for='{rid}']")
-                            if lab.count() > 0:
-                                label_text = lab.first.inner_text().strip()
-                    except Exception:
-                        pass
-                    if not label_text:
-                        # Try closest following/preceding label
-                        try:
-                            foll = r.locator("xpath=following::label[1]")
-                            if foll.count() > 0:
-                                label_text = foll.first.inner_text().strip()
-                        except Exception:
-                            pass
-                    if not label_text:
-                        # Try nearby container text
-                        try:
-                            nearby = r.evaluate("el => (el.closest('td')?.innerText) || (el.closest('tr')?.innerText) || (el.parentElement?.innerText) || '' ")
-                            label_text = (nearby or '').strip()
-                        except Exception:
-                            pass
-                    lt = (label_text or '').lower()
-                    if any(k in lt for k in keys):
-                        try:
-                            r.first.click()
-                            return True
-                        except Exception:
-                            continue
-                print(f"[Method2] Radio scan did not find keywords: {keys}")
+                labels = ctx.eval_on_selector_all("input[type='radio']", _RADIO_LABELS_JS)
             except Exception:
                 continue
-        return False
-
-    def _set_input_by_label_text(self, label_text: str, value: str):
-        # Strategies to locate the input associated with a textual label
-        targets = [self.page] + [f for f in self.page.frames]
-        strategies = []
-        # 0) Direct known id from probe
-        strategies.append(lambda ctx: ctx.locator("#ctl00_ContentPlaceHolder5_txtCommonSurvey"))
-        # 1) <label>Enter Survey No</label> -> following input
-        strategies.append(lambda ctx: ctx.locator(f"//label[contains(normalize-space(.), '{label_text}')]/following::input[1]"))
-        # 2) Any element containing the text -> following input
-        strategies.append(lambda ctx: ctx.locator(f"//*[contains(normalize-space(.), '{label_text}')]/following::input[1]"))
-        # 3) Input with aria-label/placeholder containing words
-        for key in ['survey', 'enter survey', 'survey no']:
-            strategies.append(lambda ctx, k=key: ctx.locator(f"//input[contains(translate(@aria-label,'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'), '{k}')]"))
-            strategies.append(lambda ctx, k=key: ctx.locator(f"//input[contains(translate(@placeholder,'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'), '{k}')]"))
-        # 4) Common id/name contains
-        for frag in ['Survey', 'survey', 'txtSurvey', 'txtSearch', 'Search', 'srch']:
-            strategies.append(lambda ctx, f=frag: ctx.locator(f"//input[contains(@id, '{f}') and (@type='text' or not(@type))]"))
-            strategies.append(lambda ctx, f=frag: ctx.locator(f"//input[contains(@name, '{f}') and (@type='text' or not(@type))]"))
-        # 5) Input immediately preceding the Search button
-        strategies.append(lambda ctx: ctx.locator("(//input[@type='text'])[last()]"))
-        strategies.append(lambda ctx: ctx.locator("(//button[contains(., 'Search')] | //input[@type='submit' and contains(@value,'Search')] | //input[@type='button' and contains(@value,'Search')] | //a[contains(.,'Search')])[1]/preceding::input[@type='text'][1]"))
-
-        for ctx in targets:
-            for build in strategies:
-                try:
-                    loc = build(ctx)
-                    if loc and loc.count() > 0:
-                        # Ensure element is visible and enabled
-                        try:
-                            loc.first.wait_for(state='visible', timeout=3000)
-                        except Exception:
-                            pass
-                        print(f"[Method2] Filling survey input found via strategy with value '{value}'")
-                        loc.first.fill(value)
-                        # Remember exact input used so we can find the correct results table relative to it
-                        try:
-                            self._last_survey_input = (ctx, loc.first)
-                        except Exception:
-                            self._last_survey_input = None
-                        return True
-                except Exception:
-                    continue
-        raise RuntimeError(f"Input for label '{label_text}' not found")
-
-    def _wait_and_get_results_table_html(self, timeout_ms: int = 12000):
-        """Wait for the first results table to appear after Search and return (context, inner_html).
-        Heuristics: prefer table with id '#ctl00_ContentPlaceHolder5_ruralDataGrid'. Otherwise, pick
-        a table with > 1 body rows and containing expected header keywords.
-        """
-        import time as _t
-        deadline = _t.time() + (timeout_ms / 1000.0)
-        targets = [self.page] + [f for f in self.page.frames]
-        preferred_sel = '#ctl00_ContentPlaceHolder5_ruralDataGrid'
-        header_keywords = ['Attribute', 'ऑद्योगिक', 'उपविभाग', 'Rs.', 'Rate', 'रू.', 'खुली जमीन', 'निवासी सदनिका', 'दुकाने']
-        # Function to score a candidate table as Survey results
-        def _score_table(html: str) -> int:
-            try:
-                soup = BeautifulSoup(f"<table>{html}</table>", 'html.parser')
-                rows = soup.find_all('tr')
-                if len(rows) <= 1:
-                    return 0
-                text_all = soup.get_text(' ', strip=True)
-                # Header score
-                hscore = sum(1 for k in header_keywords if k.lower() in text_all.lower())
-                # First column pattern rows (start with digit or digit+/)
-                valid_rows = 0
-                for tr in rows[1:]:
-                    tds = tr.find_all('td')
-                    if not tds:
-                        continue
-                    fc = tds[0].get_text(strip=True)
-                    if fc and __import__('re').match(r"^\d+[\-/\)]?", fc):
-                        valid_rows += 1
-                # Prefer small result sets typical of Survey No search (<20)
-                small_bonus = 2 if 1 <= valid_rows <= 20 else 0
-                return hscore * 3 + valid_rows * 2 + small_bonus
-            except Exception:
-                return 0
-        last_error = None
-        # First, try to locate table immediately following the exact survey input we filled
-        if self._last_survey_input is not None:
-            try:
-                ctx, input_loc = self._last_survey_input
-                # Check first few following tables to avoid layout container
-                best = None
-                best_score = 0
-                for k in range(1, 6):
-                    foll_tbl = input_loc.locator(f"xpath=following::table[{k}]")
-                    if not foll_tbl or foll_tbl.count() == 0:
-                        continue
-                    html = foll_tbl.first.inner_html()
-                    if not html or not html.strip():
-                        continue
-                    # Skip known SubZones pager/grid signature
-                    if 'dg_Valuation2_0' in html:
-                        continue
+            radios = ctx.locator("input[type='radio']")
+            for i, label_text in enumerate(labels):
+                lt = (label_text or '').lower()
+                if any(k in lt for k in keys):
                     try:
-                        soup = BeautifulSoup(f"<table>{html}</table>", 'html.parser')
-                        rows = soup.find_all('tr')
-                        if len(rows) <= 1:
-                            continue
-                        text_all = soup.get_text(" ", strip=True)
-                        exclude = ['Select Taluka', 'Select Village', 'Search By', 'Enter Survey No', 'Year', 'Language']
-                        if any(x.lower() in text_all.lower() for x in exclude):
-                            continue
-                        score = _score_table(html)
-                        if score > best_score:
-                            best = (ctx, html)
-                            best_score = score
+                        radios.nth(i).click()
+                        return True
                     except Exception:
                         continue
-                if best is not None and best_score > 0:
-                    return best
-            except Exception:
-                pass
-        # If that fails, approximate via geometry from a nearby input
-        anchor_rect = None
-        try:
-            for ctx in targets:
-                try:
-                    anchor = ctx.locator("//input[@type='text']").first
-                    if anchor and anchor.count() > 0:
-                        anchor_rect = anchor.evaluate("el => el.getBoundingClientRect()")
-                        if anchor_rect:
-                            break
-                except Exception:
-                    continue
-        except Exception:
-            anchor_rect = None
-        while _t.time() < deadline:
-            for ctx in targets:
-                try:
-                    # Preferred selector
-                    if ctx.locator(preferred_sel).count() > 0:
-                        try:
-                            ctx.wait_for_selector(preferred_sel, timeout=1000)
-                        except Exception:
-                            pass
-                        html = ctx.locator(preferred_sel).inner_html()
-                        if html and html.strip():
-                            return ctx, html
-                except Exception as e:
-                    last_error = e
-                try:
-                    # Fallback: any table with >1 data rows
-                    tables = ctx.locator('table')
-                    tcount = min(tables.count(), 10)  # scan first 10
-                    nearest = None
-                    nearest_dist = None
-                    best_scored = None
-                    best_sc = 0
-                    for i in range(tcount):
-                        tloc = tables.nth(i)
-                        thtml = tloc.inner_html()
-                        if not thtml or len(thtml) < 30:
-                            continue
-                        # Skip known SubZones pager/grid signature
-                        if 'dg_Valuation2_0' in thtml:
-                            continue
-                        try:
-                            soup = BeautifulSoup(f"<table>{thtml}</table>", 'html.parser')
-                            rows = soup.find_all('tr')
-                            if len(rows) <= 1:
-                                continue
-                            head_txt = soup.get_text(" ", strip=True)
-                            if any(k.lower() in head_txt.lower() for k in header_keywords):
-                                # If we have an anchor, choose the nearest table below the anchor
-                                if anchor_rect:
-                                    try:
-                                        rect = tloc.evaluate("el => el.getBoundingClientRect()")
-                                        if rect and rect.get('top', 0) >= anchor_rect.get('top', 0):
-                                            dist = rect.get('top', 0) - anchor_rect.get('bottom', 0)
-                                            if nearest is None or (dist >= 0 and dist < (nearest_dist or 1e9)):
-                                                nearest = (ctx, thtml)
-                                                nearest_dist = dist
-                                            # also score it
-                                            sc = _score_table(thtml)
-                                            if sc > best_sc:
-                                                best_scored = (ctx, thtml)
-                                                best_sc = sc
-                                            continue
-                                    except Exception:
-                                        pass
-                                # Fallback: if no anchor or rect issues, return first matching table
-                                sc = _score_table(thtml)
-                                if sc > best_sc:
-                                    best_scored = (ctx, thtml)
-                                    best_sc = sc
-                        except Exception:
-                            continue
-                    # Prefer best scored candidate if available; else nearest
-                    if best_scored is not None:
-                        return best_scored
-                    if nearest is not None:
-                        return nearest
-                except Exception as e:
-                    last_error = e
-            _t.sleep(0.4)
-        if last_error:
-            print(f"[Method2] Table wait last error: {last_error}")
-        return None, ''
+            print(f"[Method2] Radio scan did not find keywords: {keys}")
+        return False
 
     def _try_select_district_any(self, district_text: str) -> bool:
         """Fallback: scan all <select> elements and try selecting option whose visible text contains the district.
@@ -680,24 +935,20 @@ class IGRSubzoneScraper:
         if tr and tr.lower() != district_text.lower():
             candidates.insert(0, tr)
         print(f"[Method2] Fallback district selection candidates: {candidates}")
-        targets = [self.page] + [f for f in self.page.frames]
+        targets = self._contexts()
         for ctx in targets:
             try:
                 selects = ctx.locator('select')
                 count = selects.count()
                 for i in range(count):
                     sel = selects.nth(i)
-                    # Read options text
-                    opt_count = sel.locator('option').count()
-                    option_texts = []
-                    for j in range(opt_count):
-                        option_texts.append(sel.locator('option').nth(j).inner_text().strip())
+                    # Read all option texts in one call
+                    option_texts = [t.strip() for t in sel.locator('option').all_inner_texts()]
                     for cand in candidates:
                         for txt in option_texts:
                             if cand.lower() in txt.lower():
                                 print(f"[Method2] Selecting district '{txt}' in generic select[{i}]")
-                                sel.select_option(label=txt)
-                                time.sleep(1.0)
+                                self._postback(lambda: sel.select_option(label=txt))
                                 return True
             except Exception:
                 continue
@@ -707,18 +958,19 @@ class IGRSubzoneScraper:
     def run(self, district: str, year_label: str, taluka: str, village: str, surveys: List[str], translate_admin: bool = True, _retry_depth: int = 0) -> Dict:
         # Navigate with district param (use English name in URL via translation)
         self._emit_status('Navigating IGR')
-        district_param = _translate_to_en(district) if translate_admin else district
+        if translate_admin:
+            # One request for all three; later lookups below hit the cache
+            district_param, _, _ = _translate_many_to_en([district, taluka, village])
+        else:
+            district_param = district
         district_param = district_param or district
         # Ensure URL-safe
         district_param_enc = quote_plus(district_param)
         url = f"{self.base_url}{district_param_enc}"
         print(f"[Method2] District from doc: '{district}' | using in URL as: '{district_param}' -> encoded '{district_param_enc}'")
         print(f"[Method2] Navigating to: {url}")
+        # The year selection below waits for its dropdown to appear
         self.page.goto(url, wait_until='domcontentloaded')
-        try:
-            self.page.wait_for_load_state('networkidle', timeout=30000)
-        except Exception:
-            pass
         # Page is loaded
         self._emit_status('Inputting Taluka, Village and Year values')
 
@@ -733,7 +985,7 @@ class IGRSubzoneScraper:
             base_url = 'https://igreval.maharashtra.gov.in/eASR2.0/eASRCommon.aspx'
             self.page.goto(base_url, wait_until='domcontentloaded')
             try:
-                self.page.wait_for_load_state('networkidle', timeout=30000)
+                self.page.wait_for_selector('select', state='attached', timeout=30000)
             except Exception:
                 pass
             if not self._try_select_district_any(district):
@@ -754,7 +1006,6 @@ class IGRSubzoneScraper:
         else:
             print(f"[Method2] Selecting taluka (no translation): '{taluka}'")
             self._select_dropdown_label('#ctl00_ContentPlaceHolder5_ddlTaluka', taluka)
-        time.sleep(1.0)
         # Taluka selected
         self._emit_status('Inputting Taluka, Village and Year values')
 
@@ -769,7 +1020,10 @@ class IGRSubzoneScraper:
             pass
         # Select village
         ctx_village = self._find_context_with_selector('#ctl00_ContentPlaceHolder5_ddlVillage') or self.page
-        opts_len = ctx_village.locator('#ctl00_ContentPlaceHolder5_ddlVillage option').count()
+        # (text, value) of every village option, fetched in one call
+        village_opts = ctx_village.locator('#ctl00_ContentPlaceHolder5_ddlVillage option').evaluate_all(
+            "els => els.map(e => [e.innerText, e.value])"
+        )
         chosen_value = None
         if translate_admin:
             village_key = _translate_to_en(village) or village
@@ -777,21 +1031,18 @@ class IGRSubzoneScraper:
         else:
             village_key = village
             print(f"[Method2] Matching village (no translation): '{village_key}'")
-        for i in range(opts_len):
-            opt_text = ctx_village.locator('#ctl00_ContentPlaceHolder5_ddlVillage option').nth(i).inner_text().strip()
-            if village_key.lower() in opt_text.lower():
-                chosen_value = ctx_village.locator('#ctl00_ContentPlaceHolder5_ddlVillage option').nth(i).get_attribute('value')
-                print(f"[Method2] Matched village option '{opt_text}'")
-                break
+        hit = _match_option([((t or '').strip(), v) for t, v in village_opts], village_key)
+        if hit is not None:
+            opt_text, chosen_value = hit
+            print(f"[Method2] Matched village option '{opt_text}'")
         if chosen_value:
-            ctx_village.select_option('#ctl00_ContentPlaceHolder5_ddlVillage', value=chosen_value)
+            self._postback(lambda: ctx_village.select_option('#ctl00_ContentPlaceHolder5_ddlVillage', value=chosen_value))
         else:
             # fallback select by label
             try:
                 self._select_dropdown_label('#ctl00_ContentPlaceHolder5_ddlVillage', village_key)
             except Exception:
                 self._select_dropdown_label('#ctl00_ContentPlaceHolder5_ddlVillage', village)
-        time.sleep(1.0)
         # Village selected; moving to matching
         self._emit_status('Matching for Survey Numbers')
 
@@ -811,28 +1062,23 @@ class IGRSubzoneScraper:
                 ctx_tbl.wait_for_selector(results_table_sel, timeout=8000)
             except Exception:
                 pass
+            # Bound once; row and pager locators below are scoped under it
+            table_loc = ctx_tbl.locator(results_table_sel)
 
             # Helper: parse current page rows returning list of tuples (click_row_index, col2_text, col3_rate)
             def _parse_rows():
                 try:
-                    html_local = ctx_tbl.locator(results_table_sel).inner_html()
-                    soup_local = BeautifulSoup(f"<table>{html_local}</table>", 'html.parser')
-                    trs = soup_local.find_all('tr')
+                    # One evaluate returns every row's cells; no HTML transfer or re-parse
+                    cells = self._eval_on_grid(ctx_tbl, results_table_sel, _GRID_ROWS_JS)
                     out = []
-                    for j, tr in enumerate(trs):
-                        if j == 0:
-                            continue  # header row
-                        tds = tr.find_all('td')
-                        if len(tds) < 3:
-                            continue
+                    for j, row in enumerate(cells):
+                        if j == 0 or row is None:
+                            continue  # header row / fewer than 3 cells
+                        _, col2_text, col3_rate, has_link = row
                         # include only rows where first td has a SurveyNo link
-                        first_td = tds[0]
-                        has_link = first_td.find('a') is not None and ('SurveyNo' in first_td.get_text())
                         if not has_link:
                             continue
                         click_row = j + 1  # nth-child index in live table
-                        col2_text = tds[1].get_text(strip=True)
-                        col3_rate = tds[2].get_text(strip=True)
                         out.append((click_row, col2_text, col3_rate))
                     return out
                 except Exception:
@@ -860,12 +1106,8 @@ class IGRSubzoneScraper:
                 val = ''
                 for _ in range(60):
                     try:
-                        # Scroll into view to ensure rendering
-                        try:
-                            self.page.locator('textarea').first.scroll_into_view_if_needed()
-                        except Exception:
-                            pass
-                        val = self.page.locator('textarea').first.input_value()
+                        # Scroll into view and read the value in one call
+                        val = self._eval_main(_TEXTAREA_VALUE_JS) or ''
                     except Exception:
                         val = ''
                     if not val or not val.strip():
@@ -888,7 +1130,7 @@ class IGRSubzoneScraper:
 
             # Iterate pages until found or exhausted
             current_page = 1
-            prev_html = ctx_tbl.locator(results_table_sel).inner_html()
+            prev_sig = self._grid_signature(ctx_tbl, results_table_sel)
             # Remember the URL of the SubZones view so we can detect if
             # pagination kicks us to a different page under the same domain.
             try:
@@ -920,19 +1162,15 @@ class IGRSubzoneScraper:
                         print("[Method2] frmMap redirect detected at loop start; max restart attempts reached")
                         return {"error": "Repeated redirect to frmMap.aspx during SubZones pagination"}
 
-                # Small settle before processing a page (esp. first page)
-                time.sleep(1.2)
+                # Short settle before processing a page; the postback/grid-change waits did the rest
+                time.sleep(POSTBACK_SETTLE_SECONDS)
                 rows = _parse_rows()
                 print(f"[Method2] SubZones: page {current_page} has {len(rows)} data rows (with SurveyNo link)")
                 # Try each row on this page
                 found = False
                 for click_row, col2_text, col3_rate in rows:
                     try:
-                        row_css = f"{results_table_sel} tr:nth-child({click_row})"
-                        row_loc = ctx_tbl.locator(row_css)
-                        link = row_loc.locator("td:nth-child(1) a:has-text('SurveyNo')")
-                        if link.count() == 0:
-                            link = row_loc.locator("td:nth-child(1) a")
+                        link = table_loc.locator(_ROW_LINK_XPATH.format(n=click_row))
                         if link.count() == 0:
                             continue
                         # Ensure link is visible and scrolled into view
@@ -943,7 +1181,7 @@ class IGRSubzoneScraper:
                         print(f"[Method2] Clicking SurveyNo at page {current_page}, row {click_row-1}")
                         # Capture previous textarea value, if any
                         try:
-                            prev_text_val = self.page.locator('textarea').first.input_value()
+                            prev_text_val = self._eval_main(_TEXTAREA_VALUE_JS) or ''
                         except Exception:
                             prev_text_val = ''
                         link.first.click()
@@ -955,10 +1193,6 @@ class IGRSubzoneScraper:
                         if ok:
                             print(f"[Method2] All surveys found in textbox for page {current_page}, row {click_row-1}")
                             self._emit_status('Done')
-                            try:
-                                time.sleep(0.8)
-                            except Exception:
-                                pass
                             # Print final answer without mentioning column index or surveys list
                             try:
                                 print(f"Rate: {col3_rate}")
@@ -972,15 +1206,16 @@ class IGRSubzoneScraper:
                             }
                         else:
                             print(f"[Method2] Surveys NOT all present for this row; continuing")
-                            # Small pause before the next row to avoid overlapping loads
-                            time.sleep(1.0)
+                            # The next row's textarea check waits for the value to change,
+                            # so only a short settle is needed here
+                            time.sleep(POSTBACK_SETTLE_SECONDS)
                     except Exception:
                         continue
 
                 # Move to next page by clicking next page number inside the grid
                 next_page = current_page + 1
                 try:
-                    pager_link = ctx_tbl.locator(f"{results_table_sel} .cssPager a:has-text('{next_page}')")
+                    pager_link = table_loc.locator(f".cssPager a:has-text('{next_page}')")
                     if pager_link.count() == 0:
                         pager_link = ctx_tbl.get_by_text(str(next_page), exact=True)
                 except Exception:
@@ -991,18 +1226,14 @@ class IGRSubzoneScraper:
                     print(f"[Method2] Going to SubZones page {next_page}")
                     # capture current first-row signature before navigation
                     pre_sig = _first_row_sig()
-                    pager_link.first.click()
+                    self._postback(lambda: pager_link.first.click())
                     # Explicitly detect redirect to the map page, which is a
                     # known kick-out: https://igreval.maharashtra.gov.in/eASR2.0/frmMap.aspx
-                    curr_url_after_click = None
-                    for _ in range(20):  # poll URL for up to ~4s
-                        try:
-                            time.sleep(0.2)
-                            curr_url_after_click = self.page.url
-                        except Exception:
-                            curr_url_after_click = None
-                        if curr_url_after_click and 'frmMap.aspx' in curr_url_after_click:
-                            break
+                    try:
+                        self.page.wait_for_load_state('domcontentloaded', timeout=4000)
+                        curr_url_after_click = self.page.url
+                    except Exception:
+                        curr_url_after_click = None
                     if curr_url_after_click and 'frmMap.aspx' in curr_url_after_click:
                         print(f"[Method2] Detected redirect to frmMap.aspx after pagination (url='{curr_url_after_click}')")
                         # Restart the full flow once in the same tab by
@@ -1069,16 +1300,8 @@ class IGRSubzoneScraper:
                 except Exception:
                     print("[Method2] Error while waiting for SubZones grid after pagination; stopping further pagination")
                     break
-                # Wait for grid HTML to change
-                for _ in range(60):  # up to ~12s
-                    time.sleep(0.2)
-                    try:
-                        curr_html = ctx_tbl.locator(results_table_sel).inner_html()
-                        if curr_html != prev_html:
-                            prev_html = curr_html
-                            break
-                    except Exception:
-                        pass
+                # Wait for the grid to change (up to ~12s)
+                prev_sig = self._wait_grid_change(ctx_tbl, results_table_sel, prev_sig, 12000)
                 # Additionally wait for first row signature to change (safer than html diff alone)
                 for _ in range(40):  # up to ~8s
                     sig = _first_row_sig()
@@ -1096,257 +1319,349 @@ class IGRSubzoneScraper:
                 if not rows_after:
                     print("[Method2] No SurveyNo rows found after SubZones pagination; stopping further pagination")
                     break
-                time.sleep(1.2)
                 current_page = next_page
 
             return {"error": "Exhausted all SubZones pages and rows without finding all surveys"}
         except Exception as e:
             return {"error": f"Failed during SubZones scan: {e}"}
 
-        # 4) Select radio option 'Survey No.'
-        time.sleep(0.5)
-        try:
-            self.page.wait_for_selector("input[type='radio']", timeout=5000)
-        except Exception:
-            pass
-        # Try robust selection and forced check
-        if not (self._select_radio_option('Survey No.') or self._select_radio_option('Survey No') or self._select_radio_option('Survey') or self._ensure_radio_selected('Survey No') or self._ensure_radio_selected('Survey')):
-            raise RuntimeError("Could not select 'Survey No.' radio option")
-        time.sleep(0.5)
-        self._log_checked_radio(prefix="After Survey selection: ")
-        # Wait explicitly for the known survey input to appear if present on this page
+
+# ----------------------
+# Same flow over plain HTTP: eASRCommon.aspx is an ASP.NET WebForms page, so each
+# dropdown change, pager click and SurveyNo link is a form POST with
+# __EVENTTARGET set. No browser is needed unless the page layout surprises us.
+# ----------------------
+
+_RE_DO_POSTBACK = re.compile(r"__doPostBack\(\s*'([^']*)'\s*,\s*'([^']*)'\s*\)")
+
+
+class _HttpFlowUnsupported(RuntimeError):
+    """The page did not look as expected; the caller should fall back to the browser."""
+
+
+class _GridPageCache:
+    """SubZones grid pages reached through the year/taluka/village postbacks, with
+    the session cookies they were served under. A request for the same village
+    within the TTL resumes from the stored page instead of repeating the GET and
+    three postbacks. In memory only: the pages are useless once the session ends.
+    """
+
+    def __init__(self, ttl: float = HTTP_GRID_CACHE_TTL_SECONDS, max_size: int = HTTP_GRID_CACHE_MAX_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: tuple, value) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def drop(self, key: tuple) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+_grid_page_cache = _GridPageCache()
+
+
+def _cell_text(td) -> str:
+    # Same joining as BeautifulSoup's get_text(strip=True)
+    return "".join(s.strip() for s in td.itertext())
+
+
+@lru_cache(maxsize=1)
+def _http_transport():
+    """Connection pool shared by every IGRSubzoneHttpScraper, so repeat scrapes reuse
+    open TCP/TLS connections; cookies stay with each scraper's own client."""
+    import httpx  # type: ignore
+    transport = httpx.HTTPTransport(
+        limits=httpx.Limits(
+            max_keepalive_connections=HTTP_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        )
+    )
+    atexit.register(transport.close)
+    return transport
+
+
+class IGRSubzoneHttpScraper:
+    def __init__(self, progress_cb: Optional[Callable[[str], None]] = None, timeout: float = HTTP_TIMEOUT_SECONDS):
+        self.progress_cb = progress_cb
+        self.timeout = timeout
+        self.base_url = 'https://igreval.maharashtra.gov.in/eASR2.0/eASRCommon.aspx?hDistName='
+        self.client = None
+        self.url = None
+        self.tree = None
+        self.html = None
+
+    def __enter__(self):
         try:
-            self.page.wait_for_selector('#ctl00_ContentPlaceHolder5_txtCommonSurvey', timeout=5000)
-        except Exception:
-            pass
+            import httpx  # type: ignore
+        except Exception as e:
+            raise _HttpFlowUnsupported(f"httpx unavailable: {e}")
+        self.client = httpx.Client(
+            transport=_http_transport(),
+            timeout=self.timeout,
+            follow_redirects=True,
+            headers={'Accept-Language': 'en-IN,en;q=0.9', 'User-Agent': HTTP_USER_AGENT},
+        )
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Not client.close(): that would close the shared transport's connections
+        self.client = None
 
-        # 5) Enter Survey No: Use only the numeric part of the first survey number
-        if not surveys:
-            return {"error": "No survey numbers extracted from document"}
-        first_numeric = re.match(r"^(\d+)", surveys[0])
-        if not first_numeric:
-            return {"error": f"First survey number not numeric at start: {surveys[0]}"}
-        self._set_input_by_label_text('Enter Survey No', first_numeric.group(1))
-
-        # Click 'Search'
-        if not self._click_by_text_any('Search', exact=True):
-            if not self._click_by_text_any('Search', exact=False):
-                raise RuntimeError("Could not click 'Search'")
-        # Allow network/dom to settle
+    def _emit_status(self, msg: str):
+        print(f"[Status] {msg}")
         try:
-            self.page.wait_for_load_state('networkidle', timeout=5000)
+            if callable(self.progress_cb):
+                self.progress_cb(msg)
         except Exception:
             pass
-        time.sleep(0.8)
-
-        # 7) Record every row in first column of the resulting table
-        print('[Method2] Waiting for first results table...')
-        # Prefer Survey No. results grid by exact id discovered in dumps
-        survey_results_sel = '#ctl00_ContentPlaceHolder5_grdUrbanRate'
-        table_ctx = self._find_context_with_selector(survey_results_sel)
-        if table_ctx is not None:
-            try:
-                table_ctx.wait_for_selector(survey_results_sel, timeout=5000)
-            except Exception:
-                pass
-            try:
-                table_html = table_ctx.locator(survey_results_sel).inner_html()
-                print('[Method2] Using exact Survey results table by id ctl00_ContentPlaceHolder5_grdUrbanRate')
-            except Exception:
-                table_ctx = None
-                table_html = ''
+
+    # --- Page state ---
+    def _load(self, resp) -> None:
+        self.url, self.tree = self._parse(resp)
+        self.html = resp.text
+
+    @staticmethod
+    def _parse(resp):
+        resp.raise_for_status()
+        url = str(resp.url)
+        return url, lhtml.fromstring(resp.text, base_url=url)
+
+    def _post_parsed(self, action: str, data: Dict[str, str]):
+        """POST and parse without touching the current page."""
+        return self._parse(self.client.post(action, data=data))
+
+    def _get(self, url: str) -> None:
+        print(f"[Method2/http] GET {url}")
+        self._load(self.client.get(url))
+
+    def _form_data(self, target: str, argument: str = '', fields: Optional[Dict[str, str]] = None) -> Tuple[str, Dict[str, str]]:
+        """(action, data) for submitting the page's form the way __doPostBack(target, argument) would."""
+        if not self.tree.forms:
+            raise _HttpFlowUnsupported("No form on page")
+        form = self.tree.forms[0]
+        data = dict(form.form_values())
+        data['__EVENTTARGET'] = target
+        data['__EVENTARGUMENT'] = argument
+        if fields:
+            data.update(fields)
+        return form.action or self.url, data
+
+    def _postback(self, target: str, argument: str = '', fields: Optional[Dict[str, str]] = None) -> None:
+        action, data = self._form_data(target, argument, fields)
+        self._load(self.client.post(action, data=data))
+
+    def _by_id(self, element_id: str):
+        found = self.tree.xpath('//*[@id=$i]', i=element_id)
+        return found[0] if found else None
+
+    # --- Controls ---
+    def _select(self, element_id: str, label: Optional[str] = None, contains: Optional[str] = None) -> str:
+        """Pick an option (exact label, or via _match_option) and post the change back."""
+        sel = self._by_id(element_id)
+        if sel is None:
+            raise _HttpFlowUnsupported(f"Select not found: #{element_id}")
+        options = []
+        for opt in sel.iter('option'):
+            text = (opt.text_content() or '').strip()
+            options.append((text, opt.get('value', text)))
+        if label is not None:
+            hit = next((opt for opt in options if opt[0] == label), None)
         else:
-            table_html = ''
-        # Fallback to heuristic scan if exact id not found
-        if not table_html:
-            table_ctx, table_html = self._wait_and_get_results_table_html()
-        if table_ctx is None or not table_html:
-            return {"error": "Could not find first results table"}
-        try:
-            # Log a short preview of the selected table's text to verify correctness
-            tbl_preview = BeautifulSoup(f"<table>{table_html}</table>", 'html.parser').get_text(" ", strip=True)
-            print(f"[Method2] Selected table preview (first 200 chars): {tbl_preview[:200]}")
-        except Exception:
-            pass
-        soup = BeautifulSoup(f"<table>{table_html}</table>", 'html.parser')
-        recorded_first_col = []
-        for tr in soup.find_all('tr')[1:]:
-            tds = tr.find_all('td')
-            if not tds:
+            hit = _match_option(options, contains or '')
+        if hit is None:
+            raise LookupError(f"Option not found on #{element_id}: {label or contains}")
+        text, value = hit
+        print(f"[Method2/http] Selecting '{text}' on #{element_id}")
+        self._postback(sel.get('name'), fields={sel.get('name'): value})
+        return text
+
+    def _ensure_subzones(self) -> None:
+        for radio in self.tree.xpath("//input[@type='radio']"):
+            rid = radio.get('id') or ''
+            labels = self.tree.xpath('//label[@for=$i]', i=rid) if rid else []
+            text = labels[0].text_content() if labels else ''
+            if 'subzone' in (text + rid).lower().replace(' ', ''):
+                if radio.get('checked') is None:
+                    print('[Method2/http] Switching to SubZones')
+                    self._postback(radio.get('name'), fields={radio.get('name'): radio.get('value', '')})
+                return
+
+    def _grid_rows(self, grid_id: str) -> List[Tuple[str, str, str]]:
+        """(postback target of the SurveyNo link, col2 text, col3 rate) for each data row."""
+        grid = self._by_id(grid_id)
+        if grid is None:
+            return []
+        out = []
+        for tr in list(grid.iter('tr'))[1:]:
+            tds = tr.xpath('./td')
+            if len(tds) < 3:
                 continue
-            recorded_first_col.append(tds[0].get_text(strip=True))
-        print(f"[Method2] Recorded {len(recorded_first_col)} entries from first column")
-        try:
-            print("[Method2] First-column entries:")
-            for i, val in enumerate(recorded_first_col, 1):
-                print(f"  {i}. {val}")
-        except Exception:
-            pass
+            first = tds[0]
+            if 'SurveyNo' not in first.text_content():
+                continue
+            m = None
+            for a in first.iter('a'):
+                m = _RE_DO_POSTBACK.search(a.get('href') or '')
+                if m:
+                    break
+            if not m:
+                continue
+            out.append((m.group(1), _cell_text(tds[1]), _cell_text(tds[2])))
+        return out
+
+    def _pager_target(self, grid_id: str, page_num: int) -> Optional[Tuple[str, str]]:
+        grid = self._by_id(grid_id)
+        if grid is None:
+            return None
+        for a in grid.xpath(".//*[contains(concat(' ', normalize-space(@class), ' '), ' cssPager ')]//a"):
+            if (a.text_content() or '').strip() == str(page_num):
+                m = _RE_DO_POSTBACK.search(a.get('href') or '')
+                if m:
+                    return m.group(1), m.group(2)
+        return None
 
-        # 8) Select radio option 'SubZones'
-        time.sleep(0.5)
-        try:
-            self.page.wait_for_selector("input[type='radio']", timeout=5000)
-        except Exception:
-            pass
-        if not (self._select_radio_option('SubZones') or self._ensure_radio_selected('SubZones')):
-            return {"error": "Could not switch to SubZones"}
-        time.sleep(1.0)
-        self._log_checked_radio(prefix="After SubZones selection: ")
-
-        # 9-10) Iterate SubZones grid pages and match where col2 contains any of recorded_first_col (normalized)
-        results_table_sel = '#ctl00_ContentPlaceHolder5_dg_Valuation2_0'
-        matched_row_info = None
-
-        def _norm_mr(s: str) -> str:
-            s = (s or '').strip()
-            # remove spaces and common punctuation, unify case
-            s = re.sub(r"[\s\-\(\)\.:/]+", "", s)
-            return s.lower()
-
-        recorded_norm = [_norm_mr(x) for x in recorded_first_col if x]
-        print(f"[Method2] Recorded normalized keys: {recorded_norm}")
-
-        def parse_current_page():
-            nonlocal matched_row_info
-            ctx_tbl = self._find_context_with_selector(results_table_sel)
-            if ctx_tbl is None:
-                return False
-            html = ctx_tbl.locator(results_table_sel).inner_html()
-            soup2 = BeautifulSoup(f"<table>{html}</table>", 'html.parser')
-            rows = soup2.find_all('tr')[1:]
-            for idx, tr in enumerate(rows):
-                tds = tr.find_all('td')
-                if len(tds) < 3:
-                    continue
-                col1 = tds[0].get_text(strip=True)
-                col2 = tds[1].get_text(strip=True)
-                col3 = tds[2].get_text(strip=True)
-                # 10) Prefer exact normalized equality on column 2, fallback to contains
-                c2n = _norm_mr(col2)
-                matched_key = None
-                for k in recorded_norm:
-                    if not k:
-                        continue
-                    if c2n == k:
-                        matched_key = k
-                        print(f"[Method2] Match equality: row {idx+1} col2='{col2}' norm='{c2n}' == key='{k}'")
-                        break
-                if matched_key is None:
-                    for k in recorded_norm:
-                        if not k:
-                            continue
-                        if (k in c2n) or (c2n in k):
-                            matched_key = k
-                            print(f"[Method2] Match contains: row {idx+1} col2='{col2}' norm='{c2n}' ~ key='{k}'")
-                            break
-                if matched_key is not None:
-                    matched_row_info = {"row_index": idx + 1, "col1": col1, "col2": col2, "col3": col3, "matched_key": matched_key, "col2_norm": c2n}
-                    print(f"[Method2] Selected row {idx+1} -> col2='{col2}', keyUsed='{matched_key}'")
-                    return True
-            return False
+    def _textarea_value(self, tree=None) -> str:
+        found = (self.tree if tree is None else tree).xpath('//textarea')
+        return (found[0].text or '') if found else ''
 
-        # Try current page, then paginate slowly ensuring table reloads
-        if not parse_current_page():
+    # --- Main flow ---
+    def run(self, district: str, year_label: str, taluka: str, village: str, surveys: List[str], translate_admin: bool = True, _retry_depth: int = 0) -> Dict:
+        self._emit_status('Navigating IGR')
+        if translate_admin:
+            district_param, _, _ = _translate_many_to_en([district, taluka, village])
+        else:
+            district_param = district
+        district_param = district_param or district
+        grid_id = 'ctl00_ContentPlaceHolder5_dg_Valuation2_0'
+        needed = [sv.replace(' ', '') for sv in surveys]
+        scan_args = (grid_id, needed, district, year_label, taluka, village, surveys, translate_admin, _retry_depth)
+
+        cache_key = (district_param, year_label, taluka, village, translate_admin)
+        cached = _grid_page_cache.get(cache_key) if _retry_depth == 0 else None
+        if cached is not None:
+            print("[Method2/http] Resuming from the cached SubZones grid for this village")
+            self._emit_status('Matching for Survey Numbers')
+            url, html, cookies = cached
+            for cookie in cookies:
+                self.client.cookies.jar.set_cookie(cookie)
+            self.url, self.tree, self.html = url, lhtml.fromstring(html, base_url=url), html
+            # An expired or recycled ASP.NET session answers the postbacks without the
+            # grid, which _scan raises on; a clean scan's result (match or not) stands
             try:
-                ctx_tbl = self._find_context_with_selector(results_table_sel)
-                if ctx_tbl is None:
-                    return {"error": "SubZones grid not found"}
-                prev_html = ctx_tbl.locator(results_table_sel).inner_html()
-                for page_num in range(2, 51):
-                    print(f"[Method2] Going to SubZones page {page_num}")
-                    moved = False
-                    try:
-                        # Click page link within the grid pager
-                        pager_link = ctx_tbl.locator(f"{results_table_sel} .cssPager a:has-text('{page_num}')")
-                        if pager_link.count() == 0:
-                            # fallback to any exact text within grid
-                            pager_link = ctx_tbl.get_by_text(str(page_num), exact=True)
-                        if pager_link.count() > 0:
-                            pager_link.first.click()
-                            moved = True
-                    except Exception:
-                        moved = False
-                    if not moved:
-                        break
-                    # Wait for grid to reload by innerHTML changing
-                    for _ in range(20):  # up to ~4s
-                        try:
-                            time.sleep(0.2)
-                            curr_html = ctx_tbl.locator(results_table_sel).inner_html()
-                            if curr_html != prev_html:
-                                prev_html = curr_html
-                                break
-                        except Exception:
-                            time.sleep(0.2)
-                    # Give a little extra time for rows to settle
-                    time.sleep(0.6)
-                    if parse_current_page():
-                        break
-            except Exception:
-                pass
+                return self._scan(*scan_args)
+            except Exception as e:
+                print(f"[Method2/http] Cached grid page failed ({e}); selecting the dropdowns again")
+                _grid_page_cache.drop(cache_key)
+                self.client.cookies.clear()
 
-        if not matched_row_info:
-            return {"error": "No matching subzone row found"}
-
-        # 11) Click 'SurveyNo' link within the matched row only
-        try:
-            ctx_tbl_click = self._find_context_with_selector(results_table_sel) or self.page
-            row_css = f"{results_table_sel} tr:nth-child({matched_row_info['row_index']+1})"
-            row_loc = ctx_tbl_click.locator(row_css)
-            # Prefer anchor with exact text SurveyNo inside the first column
-            link = row_loc.locator("td:nth-child(1) a:has-text('SurveyNo')")
-            if link.count() == 0:
-                # Fallback: any anchor in first column
-                link = row_loc.locator("td:nth-child(1) a")
-            if link.count() == 0:
-                return {"error": "SurveyNo link not found in matched row"}
-            link.first.click()
-        except Exception:
-            return {"error": "Could not open SurveyNo details"}
+        self._get(f"{self.base_url}{quote_plus(district_param)}")
+        self._emit_status('Inputting Taluka, Village and Year values')
 
-        # 12) After click, wait for the textarea with all survey numbers
+        self._select('ctl00_ContentPlaceHolder5_ddlYear', label=year_label)
+        taluka_label = (_translate_to_en(taluka) or taluka) if translate_admin else taluka
         try:
-            self.page.wait_for_selector('textarea', timeout=15000)
-        except Exception:
-            pass
-        # Wait until textarea value is populated
-        try:
-            self.page.wait_for_function("() => { const ta = document.querySelector('textarea'); return ta && ta.value && ta.value.trim().length > 0; }", timeout=15000)
-        except Exception:
-            pass
-        time.sleep(1.0)
-        textbox_value = ""
+            self._select('ctl00_ContentPlaceHolder5_ddlTaluka', label=taluka_label)
+        except LookupError:
+            if taluka_label == taluka:
+                raise
+            self._select('ctl00_ContentPlaceHolder5_ddlTaluka', label=taluka)
+        village_key = (_translate_to_en(village) or village) if translate_admin else village
         try:
-            textbox_value = self.page.locator('textarea').first.input_value()
-        except Exception:
-            try:
-                textbox_value = self.page.locator("input[type='text']").nth(1).input_value()
-            except Exception:
-                textbox_value = ""
-
-        if not textbox_value:
-            return {"error": "Could not read survey numbers textbox"}
-
-        # 13) Verify that all considered surveys exist in the textbox
-        text_norm = textbox_value.replace(' ', '')
-        all_present = all(sv.replace(' ', '') in text_norm for sv in surveys)
-        if not all_present:
-            return {"error": "Not all input survey numbers are present in the area details"}
+            self._select('ctl00_ContentPlaceHolder5_ddlVillage', contains=village_key)
+        except LookupError:
+            self._select('ctl00_ContentPlaceHolder5_ddlVillage', label=village)
+        self._emit_status('Matching for Survey Numbers')
 
-        # 14) If all exist, use column 3 value for that matched row
-        return {
-            "status": "success",
-            "matched_subzone": matched_row_info["col2"],
-            "rate_value": matched_row_info["col3"],
-            "surveys_checked": surveys,
-        }
+        self._ensure_subzones()
+        if self._by_id(grid_id) is None:
+            raise _HttpFlowUnsupported("SubZones grid not found after village selection")
+        _grid_page_cache.put(cache_key, (self.url, self.html, list(self.client.cookies.jar)))
+        return self._scan(*scan_args)
+
+    def _scan(self, grid_id, needed, district, year_label, taluka, village, surveys, translate_admin, _retry_depth) -> Dict:
+        current_page = 1
+        while True:
+            rows = self._grid_rows(grid_id)
+            print(f"[Method2/http] SubZones: page {current_page} has {len(rows)} data rows (with SurveyNo link)")
+            if not rows:
+                break
+            pager = self._pager_target(grid_id, current_page + 1)
+            # Every row is posted from the grid page's form state, one at a time: the
+            # site's ASP.NET session handles one request at a time, and a row postback
+            # may write session state that a concurrent sibling would pick up
+            for target, col2_text, col3_rate in rows:
+                row_url, row_tree = self._post_parsed(*self._form_data(target))
+                if 'frmMap.aspx' in row_url:
+                    self.url, self.tree = row_url, row_tree
+                    return self._restart_after_map(district, year_label, taluka, village, surveys, translate_admin, _retry_depth)
+                if not row_tree.xpath('//textarea') and not row_tree.xpath('//*[@id=$i]', i=grid_id):
+                    raise _HttpFlowUnsupported("Row postback returned a page without the SubZones grid")
+                val = self._textarea_value(row_tree)
+                # Each response is fresh, so unlike the browser flow there is no stale textarea to wait out
+                if val.strip() and all(sv in val.replace(' ', '') for sv in needed):
+                    print(f"[Method2/http] All surveys found in textbox for page {current_page}")
+                    self._emit_status('Done')
+                    print(f"Rate: {col3_rate}")
+                    return {
+                        "status": "success",
+                        "matched_subzone": col2_text,
+                        "rate_value": col3_rate,
+                        "textbox_value": val,
+                    }
+            if pager is None:
+                break
+            # Only once this page's rows are done: the pager postback shares their session
+            print(f"[Method2/http] Going to SubZones page {current_page + 1}")
+            self._postback(*pager)
+            if 'frmMap.aspx' in self.url:
+                return self._restart_after_map(district, year_label, taluka, village, surveys, translate_admin, _retry_depth)
+            if self._by_id(grid_id) is None:
+                raise _HttpFlowUnsupported(f"SubZones page {current_page + 1} came back without the grid")
+            current_page += 1
+        return {"error": "Exhausted all SubZones pages and rows without finding all surveys"}
+
+    def _restart_after_map(self, district, year_label, taluka, village, surveys, translate_admin, _retry_depth) -> Dict:
+        print(f"[Method2/http] Redirected to frmMap.aspx (url='{self.url}')")
+        if _retry_depth < 1:
+            return self.run(district=district, year_label=year_label, taluka=taluka, village=village,
+                            surveys=surveys, translate_admin=translate_admin, _retry_depth=_retry_depth + 1)
+        return {"error": "Repeated redirect to frmMap.aspx during SubZones pagination"}
 
 
 # ----------------------
 # Public API
 # ----------------------
 
+def extract_many(files: List[bytes], workers: Optional[int] = None) -> List[Tuple[Optional[str], Optional[str], Optional[str], List[str]]]:
+    """Run extract_admin_and_surveys_from_docx over several .docx payloads in parallel.
+    Uses a process pool (os.cpu_count() workers by default); results are in input order.
+    """
+    if len(files) <= 1:
+        return [extract_admin_and_surveys_from_docx(b) for b in files]
+    workers = min(workers or os.cpu_count() or 1, len(files))
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(extract_admin_and_surveys_from_docx, files))
+
+
 def process_igr_from_doc(file_bytes: bytes, filename: str, year_label: str, district_override: Optional[str] = None, taluka_override: Optional[str] = None, village_override: Optional[str] = None, progress_cb: Optional[Callable[[str], None]] = None) -> Dict:
     """
     Process a Word/PDF file and fetch rate based on IGR SubZones matching.
@@ -1368,5 +1683,12 @@ def process_igr_from_doc(file_bytes: bytes, filename: str, year_label: str, dist
     if not district or not taluka or not village or not surveys:
         return {"error": "Could not extract district/taluka/village/surveys from the document"}
 
-    with IGRSubzoneScraper(headless=False, progress_cb=progress_cb) as scraper:
+    if METHOD2_TRANSPORT == 'http':
+        try:
+            with IGRSubzoneHttpScraper(progress_cb=progress_cb) as scraper:
+                return scraper.run(district=district, year_label=year_label, taluka=taluka, village=village, surveys=surveys, translate_admin=False)
+        except Exception as e:
+            print(f"[Method2] HTTP flow failed ({e}); falling back to the browser")
+
+    with IGRSubzoneScraper(progress_cb=progress_cb) as scraper:
         return scraper.run(district=district, year_label=year_label, taluka=taluka, village=village, surveys=surveys, translate_admin=False)
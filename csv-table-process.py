@@ -1,18 +1,25 @@
+from copy import deepcopy
+
 import pandas as pd
 from docx import Document
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
+from docx.oxml import OxmlElement, parse_xml
+from docx.oxml.ns import nsdecls, qn
 
 # File paths
 csv_file = "index2/extracted_property_data_prakar.csv"
 template_file = "index2/format.docx"
 output_file = "index2/output.docx"
 
-# Load CSV
-df = pd.read_csv(csv_file)
-
-# Drop last two columns
-df = df.iloc[:, :-2]
+# Load CSV, leaving out the last two columns. Cells stay as the text in the
+# file: no type inference, and empty cells are "" rather than NaN.
+ncols = len(pd.read_csv(csv_file, nrows=0).columns)
+df = pd.read_csv(
+    csv_file,
+    usecols=range(ncols - 2),
+    dtype=str,
+    na_filter=False,
+    keep_default_na=False,
+)
 
 # Load template Word doc
 doc = Document(template_file)
@@ -20,22 +27,34 @@ doc = Document(template_file)
 # Assume the first table in the template is where we insert data
 table = doc.tables[0]
 
-# Insert each row from CSV into the Word table
-for _, row in df.iterrows():
-    cells = table.add_row().cells
-    for i, value in enumerate(row):
-        cells[i].text = "" if pd.isna(value) else str(value)
-
-# Add black borders to the table
+# Insert each row from CSV into the Word table. One row added the usual way
+# serves as the template (cell widths from the table grid); every data row is a
+# copy of it with a single run per cell, appended to the table in one go.
 tbl = table._element
-tblBorders = OxmlElement('w:tblBorders')
-for border_name in ("top", "left", "bottom", "right", "insideH", "insideV"):
-    border_el = OxmlElement(f"w:{border_name}")
-    border_el.set(qn("w:val"), "single")
-    border_el.set(qn("w:sz"), "8")  # thickness
-    border_el.set(qn("w:space"), "0")
-    border_el.set(qn("w:color"), "000000")  # black
-    tblBorders.append(border_el)
+template_tr = table.add_row()._tr
+tbl.remove(template_tr)
+new_rows = []
+for row in df.itertuples(index=False, name=None):
+    tr = deepcopy(template_tr)
+    tcs = tr.findall(qn("w:tc"))
+    for i, value in enumerate(row):
+        p = tcs[i].find(qn("w:p"))
+        r = OxmlElement("w:r")
+        # Same as cell.text: runs handle tabs/line breaks and edge whitespace
+        r.text = value
+        p.append(r)
+    new_rows.append(tr)
+tbl.extend(new_rows)
+
+# Add black borders to the table (sz = thickness in eighths of a point)
+tblBorders = parse_xml(
+    f'<w:tblBorders {nsdecls("w")}>'
+    + "".join(
+        f'<w:{border_name} w:val="single" w:sz="8" w:space="0" w:color="000000"/>'
+        for border_name in ("top", "left", "bottom", "right", "insideH", "insideV")
+    )
+    + "</w:tblBorders>"
+)
 tbl.tblPr.append(tblBorders)
 
 # Save output document
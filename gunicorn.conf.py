@@ -1,4 +1,11 @@
 import os
+# main.py keeps progress and generated documents in process memory, so one
+# worker; Method 2 mostly waits on HTTP, and both Method 2 scrapers take their
+# browsers from NEWmethod2's pool, which caps how many run at once
+worker_class = "gthread"
 workers = 1
-threads = 2
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+# Method 1 runs in its own worker processes (main.py), METHOD1_PROCESS_WORKERS of
+# them (default 2, each loading pandas and python-docx); raise it on plans with more
+# memory so more of these threads' Method 1 requests run side by side
 bind = f"0.0.0.0:{os.environ.get('PORT', '10000')}"
@@ -1,49 +1,53 @@
-from playwright.sync_api import sync_playwright
-import time
-import re
-from bs4 import BeautifulSoup
+import asyncio
+from playwright.async_api import async_playwright
+from method2 import (
+    MARK_POSTBACK_PENDING_JS,
+    OPTIONS_LOADED_JS,
+    POSTBACK_SETTLED_JS,
+    is_postback_response,
+    lookup_rate,
+    range_bounds,
+    rate_table,
+)
 
 class IGRScraper:
-    def __init__(self, headless=True):
-        """Initialize the IGR scraper with Playwright"""
+    def __init__(self, headless=True, max_parallel=3):
+        """Initialize the IGR scraper with Playwright (async API)"""
         self.base_url = 'https://igreval.maharashtra.gov.in/eASR2.0/eASRCommon.aspx?hDistName='
         self.headless = headless
+        self.max_parallel = max_parallel
         self.playwright = None
         self.browser = None
-        self.page = None
+        self.context = None
+        # (district, year, taluka, village) -> task fetching that selection's table HTML,
+        # so rows for the same village share one navigation
+        self._tables = {}
     
-    def start_browser(self):
-        """Start the browser session"""
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(headless=self.headless)
-        self.page = self.browser.new_page()
+    async def start_browser(self):
+        """Start the browser session; every lookup opens its own page in one shared context"""
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch(headless=self.headless)
+        self.context = await self.browser.new_context()
         
         # Set longer timeout for slow loading pages
-        self.page.set_default_timeout(30000)
+        self.context.set_default_timeout(30000)
     
     def parse_rate_from_table(self, table_html, area_value):
         """Parse the table and find the rate for the given area value"""
         try:
-            soup = BeautifulSoup(table_html, 'html.parser')
-            table = soup.find('table', {'id': 'ctl00_ContentPlaceHolder5_ruralDataGrid'})
+            # Each table is parsed into numeric ranges once, then looked up per area value
+            table = rate_table(table_html)
             
-            if not table:
+            if table is None:
                 print("Could not find the rate table")
                 return None
             
-            rows = table.find_all('tr')[1:]  # Skip header row
-            
-            for row in rows:
-                cells = row.find_all('td')
-                if len(cells) >= 3:
-                    assessment_range = cells[1].get_text().strip()
-                    rate = cells[2].get_text().strip()
-                    
-                    # Parse the range (e.g., "1.26-2.50" or "0-1.25")
-                    if self.is_value_in_range(area_value, assessment_range):
-                        print(f"Area {area_value} falls in range: {assessment_range}")
-                        print(f"Corresponding rate: Rs. {rate}")
-                        return rate
+            match = lookup_rate(table, area_value)
+            if match is not None:
+                assessment_range, rate = match
+                print(f"Area {area_value} falls in range: {assessment_range}")
+                print(f"Corresponding rate: Rs. {rate}")
+                return rate
             
             print(f"No matching range found for area value: {area_value}")
             return None
@@ -55,26 +59,23 @@ class IGRScraper:
     def is_value_in_range(self, value, range_str):
         """Check if a value falls within a given range string"""
         try:
-            # Handle ranges like "0-1.25", "1.26-2.50", "12.51-च्या पुढे"
-            if "पुढे" in range_str:  # "च्या पुढे" means "and above"
-                # Extract the lower bound
-                match = re.search(r'([0-9.]+)', range_str)
-                if match:
-                    lower_bound = float(match.group(1))
-                    return value >= lower_bound
-            else:
-                # Regular range like "1.26-2.50"
-                parts = range_str.split('-')
-                if len(parts) == 2:
-                    lower_bound = float(parts[0])
-                    upper_bound = float(parts[1])
-                    return lower_bound <= value <= upper_bound
-            
-            return False
+            bounds = range_bounds(range_str)
+            return bounds is not None and bounds[0] <= value <= bounds[1]
         except:
             return False
     
-    def scrape_data(self, district, year, taluka, village, area_value=None):
+    async def select_and_wait(self, page, selector, label, timeout=15000):
+        """Async counterpart of method2.IGRScraper.select_and_wait: select, wait for
+        the postback and for the posted-back page to settle; raises if none arrives"""
+        await page.wait_for_selector(selector)
+        # Dependent dropdowns are filled by the previous postback
+        await page.wait_for_function(OPTIONS_LOADED_JS, arg=selector, timeout=timeout)
+        await page.evaluate(MARK_POSTBACK_PENDING_JS, selector)
+        async with page.expect_response(is_postback_response, timeout=timeout):
+            await page.select_option(selector, label=label)
+        await page.wait_for_function(POSTBACK_SETTLED_JS, arg=selector, timeout=timeout)
+    
+    async def scrape_data(self, district, year, taluka, village, area_value=None):
         """
         Scrape data for given district, year, taluka, and village
         
@@ -87,71 +88,108 @@ class IGRScraper:
         Returns:
             str: HTML content of the resulting table, or rate if area_value provided
         """
+        key = (district, year, taluka, village)
+        task = self._tables.get(key)
+        if task is None:
+            task = self._tables[key] = asyncio.ensure_future(self.fetch_table_html(*key))
+        full_table_html = await task
+        if full_table_html is None:
+            # Let a later call try this selection again
+            if self._tables.get(key) is task:
+                del self._tables[key]
+            return None
+        
+        # If area value is provided, find and print the corresponding rate
+        if area_value is not None:
+            rate = self.parse_rate_from_table(full_table_html, area_value)
+            return rate
+        
+        return full_table_html
+    
+    async def fetch_table_html(self, district, year, taluka, village):
+        """Navigate to the selection on a new page and return the rate table HTML (None on error)"""
+        if not self.context:
+            await self.start_browser()
+        page = await self.context.new_page()
         try:
-            if not self.page:
-                self.start_browser()
-            
             # Navigate to the website with district parameter
             url = f"{self.base_url}{district}"
             print(f"Navigating to: {url}")
-            self.page.goto(url)
-            
-            # Wait for page to load
-            self.page.wait_for_load_state('networkidle')
+            await page.goto(url, wait_until='domcontentloaded')
             
             # Select Year from dropdown
             print(f"Selecting year: {year}")
-            self.page.wait_for_selector('#ctl00_ContentPlaceHolder5_ddlYear')
-            self.page.select_option('#ctl00_ContentPlaceHolder5_ddlYear', label=year)
-            time.sleep(2)
+            await self.select_and_wait(page, '#ctl00_ContentPlaceHolder5_ddlYear', year)
             
             # Select Taluka from dropdown
             print(f"Selecting taluka: {taluka}")
-            self.page.wait_for_selector('#ctl00_ContentPlaceHolder5_ddlTaluka')
-            self.page.select_option('#ctl00_ContentPlaceHolder5_ddlTaluka', label=taluka)
-            time.sleep(2)
+            await self.select_and_wait(page, '#ctl00_ContentPlaceHolder5_ddlTaluka', taluka)
             
             # Select Village from dropdown
             print(f"Selecting village: {village}")
-            self.page.wait_for_selector('#ctl00_ContentPlaceHolder5_ddlVillage')
-            self.page.select_option('#ctl00_ContentPlaceHolder5_ddlVillage', label=village)
-            time.sleep(3)
+            await self.select_and_wait(page, '#ctl00_ContentPlaceHolder5_ddlVillage', village)
             
             # Wait for table to appear and extract HTML
             print("Waiting for table to load...")
-            self.page.wait_for_selector('#ctl00_ContentPlaceHolder5_ruralDataGrid', timeout=15000)
+            await page.wait_for_selector('#ctl00_ContentPlaceHolder5_ruralDataGrid', timeout=15000)
             
             # Get the HTML of the specific table
-            table_html = self.page.locator('#ctl00_ContentPlaceHolder5_ruralDataGrid').inner_html()
+            table_html = await page.locator('#ctl00_ContentPlaceHolder5_ruralDataGrid').inner_html()
             print("Table HTML extracted successfully!")
             
-            full_table_html = f"<table id='ctl00_ContentPlaceHolder5_ruralDataGrid'>{table_html}</table>"
-            
-            # If area value is provided, find and print the corresponding rate
-            if area_value is not None:
-                rate = self.parse_rate_from_table(full_table_html, area_value)
-                return rate
-            
-            return full_table_html
+            return f"<table id='ctl00_ContentPlaceHolder5_ruralDataGrid'>{table_html}</table>"
             
         except Exception as e:
             print(f"Error during scraping: {str(e)}")
             # Take screenshot for debugging
             try:
-                self.page.screenshot(path=f"error_screenshot_{district}_{taluka}_{village}.png")
+                await page.screenshot(path=f"error_screenshot_{district}_{taluka}_{village}.png")
                 print(f"Screenshot saved for debugging")
             except:
                 pass
             return None
+        finally:
+            await page.close()
     
-    def close(self):
+    async def scrape_many(self, rows):
+        """
+        Scrape several [district, year, taluka, village, area_value] rows concurrently,
+        at most max_parallel pages at a time
+        
+        Returns:
+            list: scrape_data's result for each row, in input order
+        """
+        if not self.context:
+            await self.start_browser()
+        semaphore = asyncio.Semaphore(self.max_parallel)
+        
+        async def bounded(row):
+            async with semaphore:
+                district, year, taluka, village, area_value = row
+                print(f"Finding rate for area: {area_value}")
+                return await self.scrape_data(district, year, taluka, village, area_value)
+        
+        return await asyncio.gather(*[bounded(row) for row in rows])
+    
+    async def close(self):
         """Close the browser and playwright"""
-        if self.page:
-            self.page.close()
+        if self.context:
+            await self.context.close()
         if self.browser:
-            self.browser.close()
+            await self.browser.close()
         if self.playwright:
-            self.playwright.stop()
+            await self.playwright.stop()
+
+def scrape_rows(rows, headless=True, max_parallel=3):
+    """Synchronous entry point: run IGRScraper.scrape_many on its own event loop"""
+    async def run():
+        scraper = IGRScraper(headless=headless, max_parallel=max_parallel)
+        try:
+            return await scraper.scrape_many(rows)
+        finally:
+            await scraper.close()
+    
+    return asyncio.run(run())
 
 def main():
     """Main function to test the scraper"""
@@ -167,24 +205,17 @@ def main():
         ["Thane", "2024-2025", "Ambarnath", "Ambhe", 0],
     ]
     
-    scraper = IGRScraper(headless=False)  # Set to True for headless mode
-    
     try:
-        for row in test_data:
+        # Set headless=True for headless mode
+        rates = scrape_rows(test_data, headless=False)
+        
+        for row, rate in zip(test_data, rates):
             district, year, taluka, village, area_value = row
-            print(f"Finding rate for area: {area_value}")
-            
-            # Get the rate directly
-            rate = scraper.scrape_data(district, year, taluka, village, area_value)
-            
             if not rate:
                 print(f"Failed to scrape data for {district}-{taluka}-{village}")
                 
     except Exception as e:
         print(f"Error in main execution: {str(e)}")
-    
-    finally:
-        scraper.close()
 
 if __name__ == "__main__":
     main()
@@ -1,15 +1,18 @@
+import asyncio
 import os
 import pathlib
 import json
 import re
 import csv
+from copy import deepcopy
+import itertools
+import numpy as np
 import pandas as pd
 from docx import Document
 from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
 from dotenv import load_dotenv
 import google.generativeai as genai
-import math
 from datetime import datetime
 
 # ----------------------
@@ -24,6 +27,16 @@ WORD_OUTPUT_FILE = os.path.join(WORD_EXPORT_DIR, "output.docx")
 
 # Model name is hardcoded per requirement
 GEMINI_MODEL_NAME = "models/gemini-2.5-pro"
+# How many PDFs are uploaded/extracted at the same time
+GEMINI_MAX_PARALLEL = 8
+
+CSV_HEADERS = [
+    "Serial Number", "(2) Year", "(3) Sub Registrar Number", "(4) Dast Kramank",
+    "(5) Registration Date", "(6) Document Type", "(7) Survey Number",
+    "(8) Area (sq meters)", "(9) Area (Hectares)", "(10) Stamp Duty",
+    "(11) Rate per SqM", "(12) Rate per Guntha", "(13) Rate per Ha",
+    "प्रकार", "Amount", "Source PDF", "Record # in PDF"
+]
 
 
 def load_api_key():
@@ -32,7 +45,9 @@ def load_api_key():
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
         raise RuntimeError("GOOGLE_API_KEY not found. Create a .env with GOOGLE_API_KEY=<your_key>.")
-    genai.configure(api_key=api_key)
+    # gRPC: genai caches one client per service, so every upload and extraction
+    # is multiplexed over the same long-lived HTTP/2 channel instead of new TLS sessions
+    genai.configure(api_key=api_key, transport="grpc")
 
 
 def get_multipage_extraction_prompt():
@@ -75,33 +90,41 @@ def get_multipage_extraction_prompt():
     """
 
 
+_PROMPT = get_multipage_extraction_prompt()
+
+# Everything that is not part of a plain decimal number
+_RE_NON_NUMERIC = re.compile(r"[^0-9.]")
+
+
 def clean_and_convert_to_float(value, default=0.0):
     """Safely converts a value to a float."""
     if value is None:
         return default
     try:
-        cleaned_value = re.sub(r"[^0-9.]", "", str(value))
+        cleaned_value = _RE_NON_NUMERIC.sub("", str(value))
         return float(cleaned_value) if cleaned_value else default
     except (ValueError, TypeError):
         return default
 
 
 # --- Helpers for Survey Number normalization ---
+# Western 0-9 and Devanagari ०-९
+_DIGITS = frozenset("0123456789" + "".join(chr(c) for c in range(0x0966, 0x0970)))
+_DIGIT_STRIP = str.maketrans("", "", "".join(_DIGITS))
+
+
 def _is_digit_char(c: str) -> bool:
-    # Western 0-9 or Devanagari ०-९
-    return ("0" <= c <= "9") or ("\u0966" <= c <= "\u096F")
+    return c in _DIGITS
 
 
 def _is_numeric_token(token: str) -> bool:
     token = (token or "").strip()
-    if not token:
-        return False
-    return all(_is_digit_char(ch) for ch in token)
+    return bool(token) and not token.translate(_DIGIT_STRIP)
 
 
 def _starts_with_number(token: str) -> bool:
     token = (token or "").strip()
-    return bool(token) and _is_digit_char(token[0])
+    return bool(token) and token[0] in _DIGITS
 
 
 def normalize_survey_numbers(value) -> str:
@@ -147,15 +170,17 @@ def normalize_survey_numbers(value) -> str:
     return ", ".join(out)
 
 
-def process_multipage_pdf(pdf_path: pathlib.Path, model, prompt: str):
+async def process_multipage_pdf(pdf_path: pathlib.Path, model, prompt: str):
     """Processes a single multi-page PDF, which may contain multiple records.
-    Returns list of processed record dicts.
+    Returns list of processed record dicts; area, stamp duty and amount are raw
+    floats until add_rate_columns formats them.
     """
     print(f"-> Uploading and processing '{pdf_path.name}'...")
     all_records = []
     try:
-        pdf_file = genai.upload_file(path=pdf_path, display_name=pdf_path.name)
-        response = model.generate_content([prompt, pdf_file])
+        # upload_file has no async variant; run it on a worker thread
+        pdf_file = await asyncio.to_thread(genai.upload_file, path=pdf_path, display_name=pdf_path.name)
+        response = await model.generate_content_async([prompt, pdf_file])
         json_text = response.text.strip().replace("```json", "").replace("```", "")
         list_of_data = json.loads(json_text)
 
@@ -171,12 +196,6 @@ def process_multipage_pdf(pdf_path: pathlib.Path, model, prompt: str):
             amount = clean_and_convert_to_float(data.get("amount"))
             survey_norm = normalize_survey_numbers(data.get("survey_number"))
 
-            hectares = area_sqm / 10000 if area_sqm > 0 else 0
-            rate_per_sqm = stamp_duty / area_sqm if area_sqm > 0 else 0
-            # Approximation per user's choice: 1 guntha ~ 100 sqm
-            rate_per_guntha = rate_per_sqm * 100 if rate_per_sqm > 0 else 0
-            rate_per_ha = rate_per_guntha * 100 if rate_per_guntha > 0 else 0  # = rate_per_sqm * 10000
-
             processed_data = {
                 "dast_kramank_year": data.get("dast_kramank_year", "N/A"),
                 "sub_registrar_number": data.get("sub_registrar_number", "N/A"),
@@ -184,14 +203,10 @@ def process_multipage_pdf(pdf_path: pathlib.Path, model, prompt: str):
                 "registration_date": data.get("registration_date", "N/A"),
                 "document_type": data.get("document_type", "N/A"),
                 "survey_number": survey_norm if survey_norm else "N/A",
-                "area_sq_meter": f"{area_sqm:.4f}",
-                "area_hectares": f"{hectares:.8f}",
-                "stamp_duty": f"{stamp_duty:.2f}",
-                "rate_per_sqm": f"{rate_per_sqm:.2f}",
-                "rate_per_guntha": f"{rate_per_guntha:.2f}",
-                "rate_per_ha": f"{rate_per_ha:.2f}",
+                "area_sq_meter": area_sqm,
+                "stamp_duty": stamp_duty,
                 "prakar": data.get("prakar", "N/A"),
-                "amount": f"{amount:.2f}",
+                "amount": amount,
                 "source_file": pdf_path.name,
                 "page_record_num": i + 1,
             }
@@ -204,35 +219,79 @@ def process_multipage_pdf(pdf_path: pathlib.Path, model, prompt: str):
         return []
 
 
-def export_csv(records_by_file, csv_output: str):
-    """Export all records to CSV (overwrite existing)."""
-    os.makedirs(os.path.dirname(csv_output), exist_ok=True)
-
-    headers = [
-        "Serial Number", "(2) Year", "(3) Sub Registrar Number", "(4) Dast Kramank",
-        "(5) Registration Date", "(6) Document Type", "(7) Survey Number",
-        "(8) Area (sq meters)", "(9) Area (Hectares)", "(10) Stamp Duty",
-        "(11) Rate per SqM", "(12) Rate per Guntha", "(13) Rate per Ha",
-        "प्रकार", "Amount", "Source PDF", "Record # in PDF"
-    ]
-
-    with open(csv_output, "w", newline="", encoding="utf-8") as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(headers)
-
-        serial_number = 1
-        for rec in records_by_file:
+async def process_pdfs(pdf_files, model, prompt: str, on_records):
+    """Run process_multipage_pdf for all PDFs concurrently, at most
+    GEMINI_MAX_PARALLEL at a time. on_records is called with each PDF's records
+    in pdf_files order, as soon as that PDF and all the ones before it are done."""
+    semaphore = asyncio.Semaphore(GEMINI_MAX_PARALLEL)
+
+    async def bounded(pdf_path):
+        async with semaphore:
+            return await process_multipage_pdf(pdf_path, model, prompt)
+
+    tasks = [asyncio.ensure_future(bounded(p)) for p in pdf_files]
+    for task in tasks:
+        on_records(await task)
+
+
+def add_rate_columns(records):
+    """Compute hectares and the per-sqm/guntha/ha rates for all records in one NumPy
+    pass, then format every numeric column as the CSV text (in place)."""
+    if not records:
+        return records
+    area = np.array([r["area_sq_meter"] for r in records], dtype=float)
+    stamp_duty = np.array([r["stamp_duty"] for r in records], dtype=float)
+    amount = np.array([r["amount"] for r in records], dtype=float)
+
+    has_area = area > 0
+    # Overflow gives inf/nan quietly, as Python float arithmetic does
+    with np.errstate(over="ignore", invalid="ignore"):
+        hectares = np.divide(area, 10000, out=np.zeros_like(area), where=has_area)
+        rate_per_sqm = np.divide(stamp_duty, area, out=np.zeros_like(area), where=has_area)
+        # Approximation per user's choice: 1 guntha ~ 100 sqm
+        rate_per_guntha = np.where(rate_per_sqm > 0, rate_per_sqm * 100, 0.0)
+        rate_per_ha = np.where(rate_per_guntha > 0, rate_per_guntha * 100, 0.0)  # = rate_per_sqm * 10000
+
+    columns = {
+        "area_sq_meter": ("{:.4f}", area),
+        "area_hectares": ("{:.8f}", hectares),
+        "stamp_duty": ("{:.2f}", stamp_duty),
+        "rate_per_sqm": ("{:.2f}", rate_per_sqm),
+        "rate_per_guntha": ("{:.2f}", rate_per_guntha),
+        "rate_per_ha": ("{:.2f}", rate_per_ha),
+        "amount": ("{:.2f}", amount),
+    }
+    for key, (fmt, values) in columns.items():
+        for rec, value in zip(records, values.tolist()):
+            rec[key] = fmt.format(value)
+    return records
+
+
+def csv_record_writer(csvfile):
+    """Write the CSV header to csvfile and return a function that appends one batch
+    of processed records (formatted by add_rate_columns), numbering rows serially
+    across batches, and returns the rows it wrote. Each batch is flushed so the
+    file grows while PDFs are processed."""
+    writer = csv.writer(csvfile)
+    writer.writerow(CSV_HEADERS)
+    serial_numbers = itertools.count(1)
+
+    def write_records(records):
+        rows = []
+        for rec in add_rate_columns(records):
             row = [
-                serial_number, rec["dast_kramank_year"], rec["sub_registrar_number"], rec["dast_kramank_full"],
+                next(serial_numbers), rec["dast_kramank_year"], rec["sub_registrar_number"], rec["dast_kramank_full"],
                 rec["registration_date"], rec["document_type"], rec["survey_number"],
                 rec["area_sq_meter"], rec["area_hectares"], rec["stamp_duty"],
                 rec["rate_per_sqm"], rec["rate_per_guntha"], rec["rate_per_ha"],
                 rec.get("prakar", "N/A"), rec.get("amount", ""), rec["source_file"], rec["page_record_num"]
             ]
-            writer.writerow(row)
-            serial_number += 1
+            rows.append(row)
+        writer.writerows(rows)
+        csvfile.flush()
+        return rows
 
-    print(f"CSV exported to: {csv_output}")
+    return write_records
 
 
 def add_table_borders(table):
@@ -249,13 +308,36 @@ def add_table_borders(table):
     tbl.tblPr.append(tblBorders)
 
 
-def export_word_from_csv(csv_path: str, template_path: str, output_path: str):
-    """Populate the first table of the template with CSV data and save to output_path.
+def fast_add_rows(table, rows):
+    """Append rows (sequences of cell text) to a python-docx table.
+
+    Same result as table.add_row() plus cell.text for each cell, but one added row
+    serves as the template and every data row is a copy of it with a single run per
+    cell, appended to the table in one go. Values beyond the table's column count
+    are dropped; missing trailing values leave the cell empty.
+    """
+    tbl = table._element
+    template_tr = table.add_row()._tr
+    tbl.remove(template_tr)
+    new_rows = []
+    for values in rows:
+        tr = deepcopy(template_tr)
+        for tc, value in zip(tr.findall(qn("w:tc")), values):
+            r = OxmlElement("w:r")
+            # Same as cell.text: runs handle tabs/line breaks and edge whitespace
+            r.text = value
+            tc.find(qn("w:p")).append(r)
+        new_rows.append(tr)
+    tbl.extend(new_rows)
+
+
+def export_word_from_df(df, template_path: str, output_path: str):
+    """Populate the first table of the template with the exported rows (CSV_HEADERS
+    columns) and save to output_path.
     It mirrors the existing csv-table-process.py behavior (dropping last two columns).
     """
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-    df = pd.read_csv(csv_path)
     # Drop last two columns (e.g., provenance columns)
     if df.shape[1] >= 2:
         df = df.iloc[:, :-2]
@@ -263,19 +345,18 @@ def export_word_from_csv(csv_path: str, template_path: str, output_path: str):
     doc = Document(template_path)
     table = doc.tables[0]
 
-    # Append each DataFrame row to the Word table
-    for _, row in df.iterrows():
-        cells = table.add_row().cells
-        # Write up to the number of columns available in the template table
-        max_cols = min(len(cells), len(row))
-        if len(row) > len(cells):
-            # Warn once per row if template has fewer columns than data
-            # e.g., template has 14 columns but data has 15 (includes 'Amount')
-            print(
-                f"Warning: template has {len(cells)} columns but data row has {len(row)}; extra columns will be truncated."
-            )
-        for i, value in enumerate(row[:max_cols]):
-            cells[i].text = "" if pd.isna(value) else str(value)
+    # Append each DataFrame row to the Word table, up to the number of columns
+    # available in the template table
+    ncols = len(table.columns)
+    if len(df) and df.shape[1] > ncols:
+        # e.g., template has 14 columns but data has 15 (includes 'Amount')
+        print(
+            f"Warning: template has {ncols} columns but data rows have {df.shape[1]}; extra columns will be truncated."
+        )
+    fast_add_rows(
+        table,
+        (["" if pd.isna(value) else str(value) for value in row] for row in df.itertuples(index=False, name=None)),
+    )
 
     # Add borders
     add_table_borders(table)
@@ -306,27 +387,28 @@ def main():
 
     print(f"Found {len(pdf_files)} PDF file(s) to process.")
 
-    # Process PDFs
-    prompt = get_multipage_extraction_prompt()
-    all_records = []
-    for pdf_path in pdf_files:
-        records_from_file = process_multipage_pdf(pdf_path, model, prompt)
-        all_records.extend(records_from_file)
-
-    # Export CSV (overwrite)
-    export_csv(all_records, CSV_OUTPUT_FILE)
-
-    # Export Word from CSV (overwrite)
-    export_word_from_csv(CSV_OUTPUT_FILE, WORD_TEMPLATE_FILE, WORD_OUTPUT_FILE)
+    # Process PDFs, streaming each file's records into the CSV (overwrite) and
+    # keeping the written rows for the Word export
+    prompt = _PROMPT
+    rows = []
+    with open(CSV_OUTPUT_FILE, "w", newline="", encoding="utf-8") as csvfile:
+        write_records = csv_record_writer(csvfile)
+        asyncio.run(process_pdfs(pdf_files, model, prompt, lambda records: rows.extend(write_records(records))))
+    print(f"CSV exported to: {CSV_OUTPUT_FILE}")
+    df = pd.DataFrame(rows, columns=CSV_HEADERS)
+
+    # Export Word from the same rows (overwrite)
+    export_word_from_df(df, WORD_TEMPLATE_FILE, WORD_OUTPUT_FILE)
     
     # Post-processing on the generated Word file
-    future_filter_and_aggregate(WORD_OUTPUT_FILE)
+    future_filter_and_aggregate(df, WORD_OUTPUT_FILE)
 
-def future_filter_and_aggregate(word_file_path: str):
-    """Filter rows by 'प्रकार' == 'बिनशेती जमिन', create a new table under the previous
-    table with same formatting, sort by 'प्रती चौ.मी.' descending, keep top 50% (rounding up),
-    compute average of 'प्रती चौ.मी.' and append it. Assumes first table has a merged title row,
-    header row at index 1, number row at index 2, and data from index 3 onwards."""
+def future_filter_and_aggregate(df, word_file_path: str):
+    """Filter rows of df (the exported CSV_HEADERS rows) by 'प्रकार' == 'बिनशेती जमिन',
+    create a new table under the first table of word_file_path with same formatting,
+    sort by 'प्रती चौ.मी.' descending, keep top 50% (rounding up), compute average of
+    'प्रती चौ.मी.' and append it. Assumes first table has a merged title row and the
+    header row at index 1."""
 
     doc = Document(word_file_path)
 
@@ -336,26 +418,14 @@ def future_filter_and_aggregate(word_file_path: str):
 
     base_table = doc.tables[0]
 
-    # Build a list of rows (as lists of text) and detect column indices
-    rows_text = []
-    for r_idx, row in enumerate(base_table.rows):
-        cell_texts = [cell.text.strip() for cell in row.cells]
-        rows_text.append(cell_texts)
-
-    if len(rows_text) < 2:
+    if len(base_table.rows) < 2:
         print("Base table does not contain enough rows for header/data.")
         return
 
     # Use row index 1 as the visual header row, but determine column indices by
-    # the known CSV export order (headers defined in export_csv) to avoid label mismatches.
-    visual_header = rows_text[1]
-    kept_headers = [
-        "Serial Number", "(2) Year", "(3) Sub Registrar Number", "(4) Dast Kramank",
-        "(5) Registration Date", "(6) Document Type", "(7) Survey Number",
-        "(8) Area (sq meters)", "(9) Area (Hectares)", "(10) Stamp Duty",
-        "(11) Rate per SqM", "(12) Rate per Guntha", "(13) Rate per Ha",
-        "प्रकार", "Amount"
-    ]
+    # the known CSV export order (CSV_HEADERS) to avoid label mismatches.
+    visual_header = [cell.text.strip() for cell in base_table.rows[1].cells]
+    kept_headers = CSV_HEADERS[:-2]
     # Determine column indices by position in kept_headers
     try:
         col_idx_prakar = kept_headers.index("प्रकार")
@@ -367,16 +437,13 @@ def future_filter_and_aggregate(word_file_path: str):
         col_idx_dast = kept_headers.index("(4) Dast Kramank")
         col_idx_survey = kept_headers.index("(7) Survey Number")
     except ValueError:
-        print("Internal header mapping failed; please verify export_csv headers.")
+        print("Internal header mapping failed; please verify CSV_HEADERS.")
         return
 
-    data_rows = rows_text[3:]
+    data = df.iloc[:, :len(kept_headers)].fillna("").astype(str).apply(lambda col: col.str.strip())
 
     # Filter by 'प्रकार' == 'बिनशेती जमिन'
-    filtered = [
-        r for r in data_rows
-        if len(r) > max(col_idx_prakar, col_idx_prati_chou_mi) and r[col_idx_prakar] == 'बिनशेती जमिन'
-    ]
+    filtered = data[data.iloc[:, col_idx_prakar].eq('बिनशेती जमिन')]
 
     # Prompt for date range (dd/mm/yyyy); blank to skip date filtering
     try:
@@ -389,39 +456,23 @@ def future_filter_and_aggregate(word_file_path: str):
         start_dt = None
         end_dt = None
 
-    def parse_date_safe(s: str):
-        try:
-            return datetime.strptime((s or '').strip(), "%d/%m/%Y")
-        except Exception:
-            return None
-
     if start_dt or end_dt:
-        filtered_in_range = []
-        for r in filtered:
-            dt = parse_date_safe(r[col_idx_reg_date]) if len(r) > col_idx_reg_date else None
-            if dt is None:
-                continue
-            if start_dt and dt < start_dt:
-                continue
-            if end_dt and dt > end_dt:
-                continue
-            filtered_in_range.append(r)
-        filtered = filtered_in_range
-
-    # Convert 'प्रती चौ.मी.' to float for sorting
-    def to_float_safe(s):
-        s_clean = re.sub(r"[^0-9.]", "", s or "")
-        try:
-            return float(s_clean) if s_clean else 0.0
-        except ValueError:
-            return 0.0
-
-    filtered.sort(key=lambda r: to_float_safe(r[col_idx_prati_chou_mi]), reverse=True)
-
-    # Keep top 50% rows (round up, at least 1 if any exist)
-    n = len(filtered)
-    keep_n = max(1, math.ceil(n * 0.5)) if n > 0 else 0
-    top_half = filtered[:keep_n]
+        # Parse all registration dates in one pass; unparseable dates become NaT and drop out
+        dates = pd.to_datetime(filtered.iloc[:, col_idx_reg_date], format="%d/%m/%Y", errors="coerce")
+        in_range = dates.notna()
+        if start_dt:
+            in_range &= dates >= start_dt
+        if end_dt:
+            in_range &= dates <= end_dt
+        filtered = filtered[in_range]
+
+    # Convert a text column to float (digits and '.' only; anything unparseable is 0.0)
+    def to_float_safe(col):
+        return pd.to_numeric(col.str.replace(_RE_NON_NUMERIC, "", regex=True), errors="coerce").fillna(0.0).astype(float)
+
+    # Sort by 'प्रती चौ.मी.' descending (stable, so ties keep their order)
+    prati_chou_mi = to_float_safe(filtered.iloc[:, col_idx_prati_chou_mi])
+    filtered = filtered.loc[prati_chou_mi.sort_values(ascending=False, kind="stable").index]
 
     # Insert a heading and a new table for filtered rows under the original table
     doc.add_paragraph("बिनशेती जमिन - फिल्टर केलेले")
@@ -431,10 +482,7 @@ def future_filter_and_aggregate(word_file_path: str):
     for c_idx, text in enumerate(visual_header):
         new_table.rows[0].cells[c_idx].text = text
     # Add rows
-    for r in filtered:
-        cells = new_table.add_row().cells
-        for c_idx, text in enumerate(r[:len(visual_header)]):
-            cells[c_idx].text = text
+    fast_add_rows(new_table, filtered.itertuples(index=False, name=None))
     add_table_borders(new_table)
 
     # Build a derived table (third) with selected columns in exact order:
@@ -458,28 +506,19 @@ def future_filter_and_aggregate(word_file_path: str):
     for c_idx, text in enumerate(derived_header):
         derived_table.rows[0].cells[c_idx].text = text
 
-    def compute_rate(row):
-        amt = to_float_safe(row[col_idx_amount]) if len(row) > col_idx_amount else 0.0
-        area = to_float_safe(row[col_idx_area_sqm]) if len(row) > col_idx_area_sqm else 0.0
-        return (amt / area) if area > 0 else 0.0
-
-    derived_rows = []
-    for r in filtered:
-        rate = compute_rate(r)
-        values = [r[i] if i < len(r) else "" for i in derived_indices]
-        # write row
-        cells = derived_table.add_row().cells
-        for c_idx, text in enumerate(values + [f"{rate:.2f}"]):
-            cells[c_idx].text = text
-        # keep for sorting/top-half/avg
-        derived_rows.append((values, rate))
+    amount = to_float_safe(filtered.iloc[:, col_idx_amount]).to_numpy()
+    area = to_float_safe(filtered.iloc[:, col_idx_area_sqm]).to_numpy()
+    with np.errstate(over="ignore", invalid="ignore"):
+        rate = np.divide(amount, area, out=np.zeros_like(area), where=area > 0)
+    derived = filtered.iloc[:, derived_indices].assign(_rate=rate)
+    derived["_rate_text"] = [f"{r:.2f}" for r in rate.tolist()]
+    derived_cols = list(range(len(derived_indices))) + [derived.columns.get_loc("_rate_text")]
+    fast_add_rows(derived_table, derived.iloc[:, derived_cols].itertuples(index=False, name=None))
     add_table_borders(derived_table)
 
-    # Sort by new rate column desc and keep top 50%
-    derived_rows.sort(key=lambda t: t[1], reverse=True)
-    n = len(derived_rows)
-    keep_n = max(1, math.ceil(n * 0.5)) if n > 0 else 0
-    top_half_rows = derived_rows[:keep_n]
+    # Sort by new rate column desc and keep top 50% (round up)
+    keep_n = -(-len(derived) // 2)
+    top_half = derived.sort_values("_rate", ascending=False, kind="stable").head(keep_n)
 
     # Insert a fourth table for top 50%
     doc.add_paragraph("बिनशेती जमिन - टॉप 50% (नवीन 'दर प्रती चौ.मी.' नुसार)")
@@ -488,17 +527,11 @@ def future_filter_and_aggregate(word_file_path: str):
     top_table.style = base_table.style
     for c_idx, text in enumerate(top_header):
         top_table.rows[0].cells[c_idx].text = text
-    for values, rate in top_half_rows:
-        cells = top_table.add_row().cells
-        for c_idx, text in enumerate(values + [f"{rate:.2f}"]):
-            cells[c_idx].text = text
+    fast_add_rows(top_table, top_half.iloc[:, derived_cols].itertuples(index=False, name=None))
     add_table_borders(top_table)
 
     # Compute and print average of new rate column from top_half
-    if top_half_rows:
-        avg_value = sum(rate for _, rate in top_half_rows) / len(top_half_rows)
-    else:
-        avg_value = 0.0
+    avg_value = top_half["_rate"].mean() if len(top_half) else 0.0
 
     doc.add_paragraph(f"Average दर प्रती चौ.मी. = {avg_value:.2f}")
 
@@ -1,38 +1,165 @@
 from flask import Flask, render_template, request, redirect, url_for, session, jsonify, send_file
+import hashlib
+import io
 import os
+import uuid
 import re
 from dotenv import load_dotenv
-from method1 import process_data
+from method1 import process_data_html
 from method2 import get_land_rate
 import threading
 import time
 import tempfile
-from Fin_plsplspls import RobustLandRecordOCRDocTR
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from Fin_plsplspls import get_predictor
 from NEWmethod1 import process_index2_pdf_to_html
 from NEWmethod2 import process_igr_from_doc
 
 load_dotenv()
 
-# Global variable to store latest value from external sources
+# Request threads only enqueue log records; the listener thread formats and writes them
+logger = logging.getLogger('main')
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_queue = queue.Queue(-1)
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# Global variable to store latest value from external sources. Never mutated:
+# /update rebinds it to a new dict, so readers always see one whole value
 latest_value = {"val": None}
 
+# Generated Index-II Word files, keyed by the id stored in the user's session
+GENERATED_DOCX_TTL_SECONDS = 3600
+GENERATED_DOCX_MAX_SIZE = 32
+
+# Method results (rendered HTML, Method 2 output) kept server-side so the session
+# cookie only carries their id; keyed by the id stored in the user's session.
+# One process (see gunicorn.conf.py) so every request sees the same store.
+SESSION_RESULTS_TTL_SECONDS = 2 * 3600
+SESSION_RESULTS_MAX_SIZE = 256
+
+# process_data output (texts + table HTML) for recent uploads, keyed by the
+# SHA-256 of the .docx and the excluded survey numbers; least recently used first
+method1_cache = OrderedDict()
+method1_cache_lock = threading.Lock()
+METHOD1_CACHE_SIZE = 64
+# process_data runs in worker processes, so its pandas/SQLite work does not hold
+# the GIL that the other request threads of this gunicorn worker need. Each one is
+# a full interpreter with pandas and python-docx loaded, and os.cpu_count() sees the
+# host rather than the container's share, so a fixed small default (see gunicorn.conf.py)
+METHOD1_PROCESS_WORKERS = max(1, int(os.getenv('METHOD1_PROCESS_WORKERS', '2')))
+
+# Image uploads accepted by /upload, by extension and by leading file signature
+ALLOWED_IMAGE_EXTENSIONS = frozenset(('jpg', 'jpeg', 'png'))
+IMAGE_SIGNATURES = (b'\x89PNG\r\n\x1a\n', b'\xff\xd8\xff')
+
 # Global variable to track processing status
 processing_status = {"image_processing": False, "scraping_progress": {}, "index2_progress": {"step": 0, "message": "Not started"}, "method2_progress": {"step": 0, "message": "Not started"}}
 
-# Initialize OCR processor globally
-ocr_processor = None
-
 app = Flask(__name__)
 app.secret_key = os.getenv('SECRET_KEY', 'your-secret-key-here')
 
+class _SessionStore:
+    """Values per session, keyed by an id kept in the session cookie. An entry
+    expires ttl seconds after its last use, and beyond max_size the least
+    recently used go first, so abandoned sessions do not pile up in the worker."""
+    
+    def __init__(self, ttl, max_size):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            now = time.monotonic()
+            if now - entry[0] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries[key] = (now, entry[1])
+            self._entries.move_to_end(key)
+            return entry[1]
+    
+    def put(self, key, value):
+        with self._lock:
+            now = time.monotonic()
+            self._entries[key] = (now, value)
+            self._entries.move_to_end(key)
+            # Least recently used first, so expired entries are at the front
+            while self._entries:
+                oldest = next(iter(self._entries.values()))
+                if len(self._entries) <= self.max_size and now - oldest[0] <= self.ttl:
+                    break
+                self._entries.popitem(last=False)
+    
+    def pop(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return entry[1] if entry is not None else None
+
+session_results = _SessionStore(SESSION_RESULTS_TTL_SECONDS, SESSION_RESULTS_MAX_SIZE)
+generated_docx = _SessionStore(GENERATED_DOCX_TTL_SECONDS, GENERATED_DOCX_MAX_SIZE)
+
+def get_session_results(create=False):
+    """Return this session's stored results dict (empty if none, or a new stored one if create)"""
+    results = session_results.get(session.get('results_id'))
+    if results is None and create:
+        results_id = uuid.uuid4().hex
+        results = {}
+        session_results.put(results_id, results)
+        session['results_id'] = results_id
+    return results if results is not None else {}
+
+@lru_cache(maxsize=1)
+def get_method1_pool():
+    """Worker processes for process_data, started on first use. Spawned rather
+    than forked: this process has browser and request threads running."""
+    return ProcessPoolExecutor(
+        max_workers=METHOD1_PROCESS_WORKERS,
+        mp_context=multiprocessing.get_context('spawn'),
+    )
+
+def run_process_data(docx_bytes, excluded_survey_numbers):
+    """process_data_html in a worker process; inline if the pool has broken"""
+    try:
+        return get_method1_pool().submit(process_data_html, docx_bytes, excluded_survey_numbers).result()
+    except BrokenProcessPool:
+        get_method1_pool.cache_clear()
+        return process_data_html(docx_bytes, excluded_survey_numbers)
+
+def process_data_cached(docx_bytes, excluded_survey_numbers):
+    """process_data plus the table HTML, computed once per distinct upload"""
+    key = (hashlib.sha256(docx_bytes).hexdigest(), excluded_survey_numbers)
+    with method1_cache_lock:
+        cached = method1_cache.get(key)
+        if cached is not None:
+            method1_cache.move_to_end(key)
+            return cached
+    cached = run_process_data(docx_bytes, excluded_survey_numbers)
+    with method1_cache_lock:
+        method1_cache[key] = cached
+        while len(method1_cache) > METHOD1_CACHE_SIZE:
+            method1_cache.popitem(last=False)
+    return cached
+
 def initialize_ocr():
-    """Initialize OCR processor on first use"""
-    global ocr_processor
-    if ocr_processor is None:
-        print("Initializing OCR processor...")
-        ocr_processor = RobustLandRecordOCRDocTR()
-        print("OCR processor initialized successfully!")
-    return ocr_processor
+    """Return the shared OCR processor (loaded once per process on first use)"""
+    return get_predictor()
 
 @app.route('/')
 def login():
@@ -53,11 +180,12 @@ def index():
         return redirect(url_for('login'))
     
     # Get all results from session to display them
-    result_en = session.get('method1_result_en', None)
-    result_mr = session.get('method1_result_mr', None)
-    table = session.get('method1_table', None)
-    method2_result = session.get('method2_result', None)
-    method2_error = session.get('method2_error', None)
+    results = get_session_results()
+    result_en = results.get('method1_result_en')
+    result_mr = results.get('method1_result_mr')
+    table = results.get('method1_table')
+    method2_result = results.get('method2_result')
+    method2_error = results.get('method2_error')
     
     return render_template('index.html', 
                          result_en=result_en, 
@@ -72,12 +200,8 @@ def clear_results():
         return redirect(url_for('login'))
     
     # Clear all method results from session
-    session.pop('method1_result_en', None)
-    session.pop('method1_result_mr', None)
-    session.pop('method1_table', None)
-    session.pop('method1_index2_html', None)
-    session.pop('method2_result', None)
-    session.pop('method2_error', None)
+    session_results.pop(session.pop('results_id', None))
+    generated_docx.pop(session.pop('method1_index2_docx_id', None))
     
     return redirect(url_for('index'))
 
@@ -88,12 +212,10 @@ def process():
     
     docx_file = request.files['input_file']
     excluded_survey_numbers = request.form['excluded_survey_numbers']
-    result_en, result_mr, table = process_data(docx_file.read(), excluded_survey_numbers)
+    result_en, result_mr, table_html = process_data_cached(docx_file.read(), excluded_survey_numbers)
     
-    # Store results in session to prevent form resubmission
-    session['method1_result_en'] = result_en
-    session['method1_result_mr'] = result_mr
-    session['method1_table'] = table.to_html(classes='data', header=True)
+    # Store results server-side (id in session) to prevent form resubmission
+    get_session_results(create=True).update(method1_result_en=result_en, method1_result_mr=result_mr, method1_table=table_html)
     # Try to parse and store average rate for recommendations (Tab 3)
     method1_rate_avg = None
     try:
@@ -119,7 +241,7 @@ def process():
         "status": "success",
         "result_en": result_en,
         "result_mr": result_mr,
-        "table": table.to_html(classes='data', header=True),
+        "table": table_html,
         "rate_avg": method1_rate_avg
     })
 
@@ -147,7 +269,7 @@ def process_index2():
         processing_status["index2_progress"] = {"step": 1, "message": "Detecting values using OCR"}
         pdf_bytes = pdf_file.read()
         base_date_str = request.form.get('base_date')
-        html, tmp_docx_path = process_index2_pdf_to_html(pdf_bytes, base_date_str)
+        html, docx_bytes = process_index2_pdf_to_html(pdf_bytes, base_date_str)
 
         # Step 2: Filtering relevant details (done inside NEWmethod1)
         processing_status["index2_progress"] = {"step": 2, "message": "Filtering relevant details"}
@@ -156,8 +278,13 @@ def process_index2():
         processing_status["index2_progress"] = {"step": 3, "message": "Calculating Land Price"}
 
         # Store results
-        session['method1_index2_html'] = html
-        session['method1_index2_docx_path'] = tmp_docx_path
+        get_session_results(create=True)['method1_index2_html'] = html
+        # Keep only the latest generated document per session
+        generated_docx.pop(session.pop('method1_index2_docx_id', None))
+        if docx_bytes:
+            docx_id = uuid.uuid4().hex
+            generated_docx.put(docx_id, docx_bytes)
+            session['method1_index2_docx_id'] = docx_id
         # Extract and store average rate from HTML for Tab 3 recommendation
         method1_rate_avg = None
         try:
@@ -185,7 +312,7 @@ def process_index2():
         # Step 4: Done
         processing_status["index2_progress"] = {"step": 4, "message": "Done"}
 
-        return jsonify({"status": "success", "html": html, "download": bool(tmp_docx_path), "rate_avg": method1_rate_avg})
+        return jsonify({"status": "success", "html": html, "download": bool(docx_bytes), "rate_avg": method1_rate_avg})
     except Exception as e:
         try:
             import traceback
@@ -203,11 +330,16 @@ def get_index2_progress():
 def download_index2_docx():
     if not session.get('logged_in'):
         return redirect(url_for('login'))
-    path = session.get('method1_index2_docx_path')
-    if not path or not os.path.exists(path):
+    docx_bytes = generated_docx.get(session.get('method1_index2_docx_id'))
+    if not docx_bytes:
         return jsonify({"status": "error", "message": "No generated document available"}), 404
     # Use a friendly filename
-    return send_file(path, as_attachment=True, download_name='index2_output.docx')
+    return send_file(
+        io.BytesIO(docx_bytes),
+        as_attachment=True,
+        download_name='index2_output.docx',
+        mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    )
 
 @app.route('/process_method2_new', methods=['POST'])
 def process_method2_new():
@@ -269,7 +401,7 @@ def process_method2_new():
             # Ensure Done status is reflected
             processing_status["method2_progress"] = {"step": 6, "message": "Done"}
 
-        session['method2_result'] = result
+        get_session_results(create=True)['method2_result'] = result
         return jsonify({"status": "success", "result": result})
     except Exception as e:
         processing_status["method2_progress"] = {"step": 0, "message": f"Error: {str(e)}"}
@@ -286,26 +418,21 @@ def get_method1_rate():
     rate = session.get('method1_rate_avg')
     return jsonify({"status": "success", "rate_avg": rate})
 
-@app.route('/index_method1_results')
-def index_with_method1_results():
+# Both URLs render whichever Method 1 and Method 2 results the session holds;
+# each keeps its old endpoint name for url_for
+@app.route('/index_method1_results', endpoint='index_with_method1_results')
+@app.route('/index_results')
+def index_with_results():
     if not session.get('logged_in'):
         return redirect(url_for('login'))
     
-    # Get Method 1 results
-    result_en = session.get('method1_result_en', None)
-    result_mr = session.get('method1_result_mr', None)
-    table = session.get('method1_table', None)
-    
-    # Also get Method 2 results if they exist
-    method2_result = session.get('method2_result', None)
-    method2_error = session.get('method2_error', None)
-    
+    results = get_session_results()
     return render_template('index.html', 
-                         result_en=result_en, 
-                         result_mr=result_mr, 
-                         table=table,
-                         method2_result=method2_result, 
-                         method2_error=method2_error)
+                         result_en=results.get('method1_result_en'), 
+                         result_mr=results.get('method1_result_mr'), 
+                         table=results.get('method1_table'),
+                         method2_result=results.get('method2_result'), 
+                         method2_error=results.get('method2_error'))
 
 @app.route('/check_processing_status')
 def check_processing_status():
@@ -320,10 +447,10 @@ def get_scraping_progress():
         # Get the most recent session (last one in the dict)
         session_id = list(processing_status["scraping_progress"].keys())[-1]
         progress = processing_status["scraping_progress"][session_id]
-        print(f"[PROGRESS] Active session {session_id}: Step {progress['step']} - {progress['message']}")
+        logger.debug("[PROGRESS] Active session %s: Step %s - %s", session_id, progress['step'], progress['message'])
         return jsonify(progress)
     
-    print(f"[PROGRESS] No active sessions found")
+    logger.debug("[PROGRESS] No active sessions found")
     return jsonify({"step": 0, "message": "Not started"})
 
 @app.route('/process_method2', methods=['POST'])
@@ -355,137 +482,99 @@ def process_method2():
     processing_status["scraping_progress"].pop(session_id, None)
     
     # Store result in session to prevent form resubmission
+    results = get_session_results(create=True)
     if 'error' in result:
-        session['method2_error'] = result['error']
-        session.pop('method2_result', None)
+        results['method2_error'] = result['error']
+        results.pop('method2_result', None)
         return jsonify({"status": "error", "message": result['error']})
     else:
-        session['method2_result'] = result
-        session.pop('method2_error', None)
+        results['method2_result'] = result
+        results.pop('method2_error', None)
         return jsonify({"status": "success", "result": result})
 
 def get_land_rate_with_progress(district, year, taluka, village, area_value, session_id):
     """Wrapper function to track progress during scraping"""
-    from method2 import IGRScraper
+    from method2 import IGRScraper, rate_table, rate_table_cache, lookup_rate
     
     scraper = IGRScraper(headless=True)
+    cache_key = (district, year, taluka, village)
+    full_table_html = rate_table_cache.get(cache_key)
     
     try:
-        # Step 1: Connecting to database
-        processing_status["scraping_progress"][session_id] = {"step": 1, "message": "Connecting to IGR Maharashtra database..."}
-        print(f"[PROGRESS] Step 1: Connecting to database")
-        scraper.start_browser()
-        time.sleep(1)  # Give frontend time to catch up
-        
-        # Step 2: Navigating to district
-        processing_status["scraping_progress"][session_id] = {"step": 2, "message": "Locating district and taluka records..."}
-        print(f"[PROGRESS] Step 2: Navigating to {district}")
-        url = f"{scraper.base_url}{district}"
-        scraper.page.goto(url, wait_until='domcontentloaded')
-        time.sleep(1)
-        
-        # Step 3: Selecting year and taluka
-        processing_status["scraping_progress"][session_id] = {"step": 3, "message": "Searching village assessment data..."}
-        print(f"[PROGRESS] Step 3: Selecting {year} and {taluka}")
-        scraper.page.wait_for_selector('#ctl00_ContentPlaceHolder5_ddlYear', timeout=15000)
-        scraper.page.select_option('#ctl00_ContentPlaceHolder5_ddlYear', label=year)
-        time.sleep(2)
-        scraper.page.wait_for_load_state('networkidle')
-        
-        scraper.page.wait_for_selector('#ctl00_ContentPlaceHolder5_ddlTaluka', timeout=15000)
-        scraper.page.select_option('#ctl00_ContentPlaceHolder5_ddlTaluka', label=taluka)
-        time.sleep(2)
-        scraper.page.wait_for_load_state('networkidle')
-        
-        # Step 4: Selecting village and loading table
-        processing_status["scraping_progress"][session_id] = {"step": 4, "message": "Analyzing land rate tables..."}
-        print(f"[PROGRESS] Step 4: Selecting village {village}")
-        scraper.page.wait_for_selector('#ctl00_ContentPlaceHolder5_ddlVillage', timeout=15000)
-        scraper.page.wait_for_function(
-            "document.querySelector('#ctl00_ContentPlaceHolder5_ddlVillage').options.length > 1",
-            timeout=10000
-        )
-        scraper.page.select_option('#ctl00_ContentPlaceHolder5_ddlVillage', label=village)
-        time.sleep(2)
-        scraper.page.wait_for_load_state('networkidle')
-        
-        # Step 5: Processing table data
-        processing_status["scraping_progress"][session_id] = {"step": 5, "message": "Calculating final rates..."}
-        print(f"[PROGRESS] Step 5: Loading table data")
-        scraper.page.wait_for_selector('#ctl00_ContentPlaceHolder5_ruralDataGrid', timeout=15000)
-        table_html = scraper.page.locator('#ctl00_ContentPlaceHolder5_ruralDataGrid').inner_html()
-        time.sleep(1)
+        if full_table_html is None:
+            # Step 1: Connecting to database
+            processing_status["scraping_progress"][session_id] = {"step": 1, "message": "Connecting to IGR Maharashtra database..."}
+            logger.info("[PROGRESS] Step 1: Connecting to database")
+            scraper.start_browser()
+            time.sleep(1)  # Give frontend time to catch up
+            
+            # Step 2: Navigating to district
+            processing_status["scraping_progress"][session_id] = {"step": 2, "message": "Locating district and taluka records..."}
+            logger.info("[PROGRESS] Step 2: Navigating to %s", district)
+            url = f"{scraper.base_url}{district}"
+            scraper.page.goto(url, wait_until='domcontentloaded')
+            time.sleep(1)
+            
+            # Step 3: Selecting year and taluka
+            processing_status["scraping_progress"][session_id] = {"step": 3, "message": "Searching village assessment data..."}
+            logger.info("[PROGRESS] Step 3: Selecting %s and %s", year, taluka)
+            scraper.select_and_wait('#ctl00_ContentPlaceHolder5_ddlYear', year)
+            scraper.select_and_wait('#ctl00_ContentPlaceHolder5_ddlTaluka', taluka)
+            
+            # Step 4: Selecting village and loading table
+            processing_status["scraping_progress"][session_id] = {"step": 4, "message": "Analyzing land rate tables..."}
+            logger.info("[PROGRESS] Step 4: Selecting village %s", village)
+            scraper.select_and_wait('#ctl00_ContentPlaceHolder5_ddlVillage', village)
+            
+            # Step 5: Processing table data
+            processing_status["scraping_progress"][session_id] = {"step": 5, "message": "Calculating final rates..."}
+            logger.info("[PROGRESS] Step 5: Loading table data")
+            scraper.page.wait_for_selector('#ctl00_ContentPlaceHolder5_ruralDataGrid', timeout=15000)
+            table_html = scraper.page.locator('#ctl00_ContentPlaceHolder5_ruralDataGrid').inner_html()
+            full_table_html = f"<table id='ctl00_ContentPlaceHolder5_ruralDataGrid'>{table_html}</table>"
+            time.sleep(1)
+        else:
+            logger.info("[PROGRESS] Using the cached rate table for %s", village)
         
         # Step 6: Final calculation
         processing_status["scraping_progress"][session_id] = {"step": 6, "message": "Processing complete!"}
-        print(f"[PROGRESS] Step 6: Processing complete")
+        logger.info("[PROGRESS] Step 6: Processing complete")
         
         # Parse and return result (using existing logic from method2)
-        from bs4 import BeautifulSoup
-        import re
-        
-        full_table_html = f"<table id='ctl00_ContentPlaceHolder5_ruralDataGrid'>{table_html}</table>"
-        soup = BeautifulSoup(full_table_html, 'html.parser')
-        table = soup.find('table', {'id': 'ctl00_ContentPlaceHolder5_ruralDataGrid'})
+        table = rate_table(full_table_html)
         
-        if not table:
+        if table is None:
             return {"error": "Could not find the rate table"}
+        rate_table_cache.put(cache_key, full_table_html)
         
-        rows = table.find_all('tr')[1:]  # Skip header row
-        
-        for row in rows:
-            cells = row.find_all('td')
-            if len(cells) >= 3:
-                assessment_range = cells[1].get_text().strip()
-                rate_hectares = cells[2].get_text().strip()
+        # Row whose range holds area_value
+        match = lookup_rate(table, area_value)
+        if match:
+            assessment_range, rate_hectares = match
+            try:
+                rate_per_hectare = float(rate_hectares)
+                rate_per_sqm = rate_per_hectare / 10000
+                
+                # Keep progress active for a moment to show completion
+                time.sleep(2)
                 
-                # Check if area_value fits in range
-                if scraper.is_value_in_range(area_value, assessment_range):
-                    try:
-                        rate_per_hectare = float(rate_hectares)
-                        rate_per_sqm = rate_per_hectare / 10000
-                        
-                        # Keep progress active for a moment to show completion
-                        time.sleep(2)
-                        
-                        return {
-                            "range": assessment_range,
-                            "rate_hectares": rate_per_hectare,
-                            "rate_sqm": rate_per_sqm,
-                            "area_value": area_value
-                        }
-                    except ValueError:
-                        return {"error": f"Could not convert rate to number: {rate_hectares}"}
+                return {
+                    "range": assessment_range,
+                    "rate_hectares": rate_per_hectare,
+                    "rate_sqm": rate_per_sqm,
+                    "area_value": area_value
+                }
+            except ValueError:
+                return {"error": f"Could not convert rate to number: {rate_hectares}"}
         
         return {"error": f"No matching range found for area value: {area_value}"}
         
     except Exception as e:
-        print(f"[PROGRESS] Error: {str(e)}")
+        logger.error("[PROGRESS] Error: %s", e)
         return {"error": str(e)}
     finally:
         scraper.close_browser()
 
-@app.route('/index_results')
-def index_with_results():
-    if not session.get('logged_in'):
-        return redirect(url_for('login'))
-    
-    # Get Method 2 results
-    method2_result = session.get('method2_result', None)
-    method2_error = session.get('method2_error', None)
-    
-    # Also get Method 1 results if they exist
-    result_en = session.get('method1_result_en', None)
-    result_mr = session.get('method1_result_mr', None)
-    table = session.get('method1_table', None)
-    
-    return render_template('index.html', 
-                         method2_result=method2_result, 
-                         method2_error=method2_error,
-                         result_en=result_en, 
-                         result_mr=result_mr, 
-                         table=table)
-
 @app.route('/update', methods=['POST'])
 def update_value():
     """POST endpoint to receive and store values from external sources like Google Colab"""
@@ -500,29 +589,29 @@ def update_value():
         
         # Store the value
         received_val = data['val']
-        latest_value['val'] = received_val
+        latest_value = {"val": received_val}
         
         # Print to terminal for debugging
-        print(f"[UPDATE] Received value from external source: {received_val}")
-        print(f"[UPDATE] Current stored value: {latest_value}")
+        logger.info("[UPDATE] Received value from external source: %s", received_val)
+        logger.debug("[UPDATE] Current stored value: %s", latest_value)
         
         return jsonify({"status": "success", "received": received_val}), 200
         
     except Exception as e:
-        print(f"[ERROR] Failed to process update request: {str(e)}")
+        logger.error("[ERROR] Failed to process update request: %s", e)
         return jsonify({"status": "error", "message": str(e)}), 500
 
 @app.route('/get', methods=['GET'])
 def get_value():
     """GET endpoint to retrieve the latest stored value"""
-    global latest_value
     
     try:
-        print(f"[GET] Returning stored value: {latest_value}")
-        return jsonify(latest_value), 200
+        snapshot = latest_value
+        logger.debug("[GET] Returning stored value: %s", snapshot)
+        return jsonify(snapshot), 200
         
     except Exception as e:
-        print(f"[ERROR] Failed to retrieve value: {str(e)}")
+        logger.error("[ERROR] Failed to retrieve value: %s", e)
         return jsonify({"status": "error", "message": str(e)}), 500
 
 @app.route('/upload', methods=['POST'])
@@ -540,25 +629,28 @@ def upload_file():
         if file.filename == '':
             return jsonify({"status": "error", "message": "No file uploaded"}), 400
         
-        # Validate file type (jpg/png)
-        allowed_extensions = {'jpg', 'jpeg', 'png'}
-        file_extension = file.filename.rsplit('.', 1)[1].lower() if '.' in file.filename else ''
-        
-        if file_extension not in allowed_extensions:
+        # Validate file type (jpg/png): extension, then the actual image signature
+        file_extension = file.filename.rpartition('.')[2].lower()
+        if file_extension not in ALLOWED_IMAGE_EXTENSIONS:
+            return jsonify({"status": "error", "message": "Only JPG and PNG files are allowed"}), 400
+        header = file.stream.read(8)
+        file.stream.seek(0)
+        if not header.startswith(IMAGE_SIGNATURES):
             return jsonify({"status": "error", "message": "Only JPG and PNG files are allowed"}), 400
         
         try:
-            print(f"[UPLOAD] Received file: {file.filename} ({file.mimetype})")
+            logger.info("[UPLOAD] Received file: %s (%s)", file.filename, file.mimetype)
             
             # Set image processing flag
             processing_status["image_processing"] = True
             
-            # Save uploaded file to temporary location
+            # Stream the upload into a temporary file (64 KiB at a time, through the
+            # already-open handle) for the path-based OCR
             with tempfile.NamedTemporaryFile(delete=False, suffix=f'.{file_extension}') as temp_file:
-                file.save(temp_file.name)
+                file.save(temp_file, buffer_size=64 * 1024)
                 temp_file_path = temp_file.name
             
-            print(f"[OCR] Processing image locally: {temp_file_path}")
+            logger.info("[OCR] Processing image locally: %s", temp_file_path)
             
             # Initialize OCR processor and process image
             ocr = initialize_ocr()
@@ -567,7 +659,9 @@ def upload_file():
             # Clean up temporary file
             os.unlink(temp_file_path)
             
-            print(f"[OCR] Local OCR results: {ocr_results}")
+            logger.info("[OCR] Extracted assessment %s, total cultivable area %s",
+                        ocr_results.get('assessment'), ocr_results.get('total_cultivable_area'))
+            logger.debug("[OCR] Local OCR results: %s", ocr_results)
             
             # Calculate assessment value (assessment / total_cultivable_area)
             try:
@@ -588,9 +682,9 @@ def upload_file():
                     
                     calculated_assessment = assessment_val / total_area_val
                     
-                    print(f"[CALCULATION] Assessment: {assessment} -> {assessment_val}")
-                    print(f"[CALCULATION] Total Area: {total_cultivable_area} -> {total_area_val}")
-                    print(f"[CALCULATION] Calculated Assessment Value: {calculated_assessment}")
+                    logger.info("[CALCULATION] Assessment: %s -> %s", assessment, assessment_val)
+                    logger.info("[CALCULATION] Total Area: %s -> %s", total_cultivable_area, total_area_val)
+                    logger.info("[CALCULATION] Calculated Assessment Value: %s", calculated_assessment)
                     
                     # Clear image processing flag
                     processing_status["image_processing"] = False
@@ -613,7 +707,7 @@ def upload_file():
                     
             except (ValueError, ZeroDivisionError) as e:
                 processing_status["image_processing"] = False
-                print(f"[ERROR] Calculation failed: {str(e)}")
+                logger.error("[ERROR] Calculation failed: %s", e)
                 return jsonify({
                     "status": "error",
                     "message": f"Failed to calculate assessment value: {str(e)}",
@@ -622,12 +716,12 @@ def upload_file():
                 
         except Exception as e:
             processing_status["image_processing"] = False
-            print(f"[ERROR] Local OCR processing failed: {str(e)}")
+            logger.error("[ERROR] Local OCR processing failed: %s", e)
             return jsonify({"status": "error", "message": f"OCR processing failed: {str(e)}"}), 500
         
     except Exception as e:
         processing_status["image_processing"] = False
-        print(f"[ERROR] File upload processing failed: {str(e)}")
+        logger.error("[ERROR] File upload processing failed: %s", e)
         return jsonify({"status": "error", "message": str(e)}), 500
 
 if __name__ == '__main__':
@@ -95,3 +95,9 @@ def process_data(docx_file_bytes, excluded_survey_numbers_str):
         return f"The average of these {half_rows} purchase and sale transactions is Rs. {average_sqm:.2f}/- per sq. m." if average_sqm else "Could not calculate the average 'Per sq. M.' due to missing data or column.", f"सदर {half_rows} खरेदी विक्री व्यवहारांची सरासरी रु. {average_sqm:.2f}/- प्रती चौ. मी." if average_sqm else "", top_half_df
     except Exception as e:
         return f"An error occurred: {e}", "", pd.DataFrame()
+
+def process_data_html(docx_file_bytes, excluded_survey_numbers_str):
+    """process_data with the table rendered to HTML, so the whole result is plain
+    strings that are cheap to send back from a worker process"""
+    result_en, result_mr, table = process_data(docx_file_bytes, excluded_survey_numbers_str)
+    return result_en, result_mr, table.to_html(classes='data', header=True)
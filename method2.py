@@ -1,33 +1,138 @@
 import time
-from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
+from bisect import bisect_right
+from collections import OrderedDict
+from functools import lru_cache
+from lxml import html as lhtml
 import re
 import atexit
-
-# Thread-local browser instances to avoid greenlet switching issues
 import threading
-_thread_local = threading.local()
 
-def get_browser_instance():
-    """Get or create thread-local browser instance"""
-    if not hasattr(_thread_local, 'browser_instance'):
-        print("Initializing browser for current thread...")
-        try:
-            playwright = sync_playwright().start()
-            browser = playwright.chromium.launch(
-                headless=True,
-                args=['--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu', '--disable-extensions']
-            )
-            _thread_local.browser_instance = {
-                'playwright': playwright,
-                'browser': browser
-            }
-            print("Browser initialization complete for thread!")
-        except Exception as e:
-            print(f"Failed to initialize browser: {e}")
-            _thread_local.browser_instance = None
+# Browsers come from NEWmethod2's pool, which also keeps them per thread and
+# caps how many the app runs at once
+from NEWmethod2 import _browser_pool
+
+# Page assets the rate-table scrape never needs
+_BLOCKED_RESOURCE_TYPES = frozenset({'image', 'font', 'stylesheet', 'media'})
+
+# Rate tables are published per year, so a fetched one is reused for a few hours
+RATE_TABLE_CACHE_TTL_SECONDS = 6 * 3600
+RATE_TABLE_CACHE_MAX_SIZE = 256
+
+# Dropdown postbacks, shared with igr_scraper's async scraper. The changed select
+# is tagged before the postback; the document is settled once a select without
+# the tag (the posted-back one) is in place.
+OPTIONS_LOADED_JS = "sel => document.querySelector(sel).options.length > 1"
+MARK_POSTBACK_PENDING_JS = "sel => document.querySelector(sel).setAttribute('data-postback-pending', '')"
+POSTBACK_SETTLED_JS = """sel => {
+    const el = document.querySelector(sel);
+    return document.readyState !== 'loading' && !!el && !el.hasAttribute('data-postback-pending');
+}"""
+
+def is_postback_response(response):
+    """True for the response to the form posting back to eASRCommon.aspx"""
+    return 'eASRCommon.aspx' in response.url and response.request.method == 'POST'
+
+def rate_table_rows(table_html):
+    """(assessment range, rate) text of each data row of the rural rate table,
+    or None when table_html has no such table"""
+    tree = lhtml.fromstring(table_html)
+    found = tree.xpath("descendant-or-self::table[@id='ctl00_ContentPlaceHolder5_ruralDataGrid']")
+    if not found:
+        return None
+    rows = []
+    for row in list(found[0].iter('tr'))[1:]:  # Skip header row
+        cells = list(row.iter('td'))
+        if len(cells) >= 3:
+            rows.append((cells[1].text_content().strip(), cells[2].text_content().strip()))
+    return rows
+
+def range_bounds(range_str):
+    """(lower, upper) of a range string, upper being inf for "and above"; None if it does not parse"""
+    try:
+        # Handle ranges like "0-1.25", "1.26-2.50", "12.51-च्या पुढे"
+        if "पुढे" in range_str:  # "च्या पुढे" means "and above"
+            # Extract the lower bound
+            match = re.search(r'([0-9.]+)', range_str)
+            if match:
+                return float(match.group(1)), float('inf')
+        else:
+            # Regular range like "1.26-2.50"
+            parts = range_str.split('-')
+            if len(parts) == 2:
+                return float(parts[0]), float(parts[1])
+        
+        return None
+    except ValueError:
+        return None
+
+@lru_cache(maxsize=64)
+def rate_table(table_html):
+    """
+    The rural rate table parsed once per distinct HTML into (lowers, entries, disjoint)
+    for lookup_rate, or None when table_html has no such table
     
-    return _thread_local.browser_instance
+    entries holds (lower, upper, range text, rate) per data row whose range parses,
+    in table order; disjoint is True when the ranges ascend without overlapping.
+    """
+    rows = rate_table_rows(table_html)
+    if rows is None:
+        return None
+    entries = []
+    for assessment_range, rate in rows:
+        bounds = range_bounds(assessment_range)
+        if bounds is not None:
+            entries.append((bounds[0], bounds[1], assessment_range, rate))
+    disjoint = all(a[1] < b[0] for a, b in zip(entries, entries[1:]))
+    return tuple(e[0] for e in entries), tuple(entries), disjoint
+
+def lookup_rate(table, value):
+    """(range text, rate) of the row of a rate_table whose range holds value, or None"""
+    lowers, entries, disjoint = table
+    try:
+        if disjoint:
+            # Only the last range starting at or below value can hold it
+            i = bisect_right(lowers, value) - 1
+            candidates = entries[i:i + 1] if i >= 0 else ()
+        else:
+            # First matching row wins, as in the table
+            candidates = entries
+        for lower, upper, assessment_range, rate in candidates:
+            if lower <= value <= upper:
+                return assessment_range, rate
+    except TypeError:
+        pass
+    return None
+
+class _RateTableCache:
+    """Rate table HTML per (district, year, taluka, village), so a repeat lookup for
+    the same village (any area value) skips the browser. In memory, with a TTL."""
+    
+    def __init__(self, ttl=RATE_TABLE_CACHE_TTL_SECONDS, max_size=RATE_TABLE_CACHE_MAX_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, table_html = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return table_html
+    
+    def put(self, key, table_html):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), table_html)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+rate_table_cache = _RateTableCache()
 
 class IGRScraper:
     def __init__(self, headless=True):
@@ -39,45 +144,42 @@ class IGRScraper:
         self.page = None
     
     def start_browser(self):
-        """Start the browser session using thread-local instance"""
-        browser_instance = get_browser_instance()
+        """Start the browser session on a pooled browser; blocks while the pool's
+        cap of browsers is in use. Pair with close_browser()."""
+        self.playwright, self.browser = _browser_pool.acquire(self.headless, 0)
         
-        if browser_instance is not None:
-            print("Using thread-local browser instance...")
-            self.playwright = browser_instance['playwright']
-            self.browser = browser_instance['browser']
-            
+        try:
             # Always create a new page for each scraping session
             self.page = self.browser.new_page()
+            self.page.route('**/*', self._route_static)
             
             # Set reasonable timeout for dynamic content
             self.page.set_default_timeout(20000)
+        except Exception:
+            _browser_pool.release(self.playwright, self.browser, self.headless, 0, reusable=False)
+            self.page = None
+            self.browser = None
+            self.playwright = None
+            raise
+    
+    @staticmethod
+    def _route_static(route):
+        if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+            route.abort()
         else:
-            raise Exception("Failed to initialize browser")
+            route.continue_()
     
     def parse_rate_from_table(self, table_html, area_value):
         """Parse the table and find the rate for the given area value"""
         try:
-            soup = BeautifulSoup(table_html, 'html.parser')
-            table = soup.find('table', {'id': 'ctl00_ContentPlaceHolder5_ruralDataGrid'})
+            table = rate_table(table_html)
             
-            if not table:
+            if table is None:
                 print("Could not find the rate table")
                 return None
             
-            rows = table.find_all('tr')[1:]  # Skip header row
-            
-            for row in rows:
-                cells = row.find_all('td')
-                if len(cells) >= 3:
-                    assessment_range = cells[1].get_text().strip()
-                    rate = cells[2].get_text().strip()
-                    
-                    # Parse the range (e.g., "1.26-2.50" or "0-1.25")
-                    if self.is_value_in_range(area_value, assessment_range):
-                        return rate
-            
-            return None
+            match = lookup_rate(table, area_value)
+            return match[1] if match else None
             
         except Exception as e:
             print(f"Error parsing table: {str(e)}")
@@ -86,25 +188,56 @@ class IGRScraper:
     def is_value_in_range(self, value, range_str):
         """Check if a value falls within a given range string"""
         try:
-            # Handle ranges like "0-1.25", "1.26-2.50", "12.51-च्या पुढे"
-            if "पुढे" in range_str:  # "च्या पुढे" means "and above"
-                # Extract the lower bound
-                match = re.search(r'([0-9.]+)', range_str)
-                if match:
-                    lower_bound = float(match.group(1))
-                    return value >= lower_bound
-            else:
-                # Regular range like "1.26-2.50"
-                parts = range_str.split('-')
-                if len(parts) == 2:
-                    lower_bound = float(parts[0])
-                    upper_bound = float(parts[1])
-                    return lower_bound <= value <= upper_bound
-            
-            return False
+            bounds = range_bounds(range_str)
+            return bounds is not None and bounds[0] <= value <= bounds[1]
         except:
             return False
     
+    def select_and_wait(self, selector, label, timeout=15000):
+        """Select a dropdown option, wait for the ASP.NET postback it triggers and
+        for the page to swap in the posted-back document, instead of sleeping a
+        fixed time. Raises if no postback arrives within timeout."""
+        self.page.wait_for_selector(selector, timeout=timeout)
+        # Dependent dropdowns are filled by the previous postback
+        self.page.wait_for_function(OPTIONS_LOADED_JS, arg=selector, timeout=timeout)
+        self.page.evaluate(MARK_POSTBACK_PENDING_JS, selector)
+        with self.page.expect_response(is_postback_response, timeout=timeout):
+            self.page.select_option(selector, label=label)
+        # The response is in, but the browser may still be showing the old document
+        self.page.wait_for_function(POSTBACK_SETTLED_JS, arg=selector, timeout=timeout)
+    
+    def fetch_table_html(self, district, year, taluka, village):
+        """Drive the page to the village's rate table and return it as a <table> element"""
+        if not self.page:
+            self.start_browser()
+        
+        # Navigate to the website with district parameter
+        url = f"{self.base_url}{district}"
+        print(f"Navigating to: {url}")
+        self.page.goto(url, wait_until='domcontentloaded')
+        
+        # Select Year from dropdown
+        print(f"Selecting year: {year}")
+        self.select_and_wait('#ctl00_ContentPlaceHolder5_ddlYear', year)
+        
+        # Select Taluka from dropdown
+        print(f"Selecting taluka: {taluka}")
+        self.select_and_wait('#ctl00_ContentPlaceHolder5_ddlTaluka', taluka)
+        
+        # Select Village from dropdown (its options come from the taluka postback)
+        print(f"Selecting village: {village}")
+        self.select_and_wait('#ctl00_ContentPlaceHolder5_ddlVillage', village)
+        
+        # Wait for table to appear and extract HTML
+        print("Waiting for table to load...")
+        self.page.wait_for_selector('#ctl00_ContentPlaceHolder5_ruralDataGrid', timeout=15000)
+        
+        # Get the HTML of the specific table
+        table_html = self.page.locator('#ctl00_ContentPlaceHolder5_ruralDataGrid').inner_html()
+        print("Table HTML extracted successfully!")
+        
+        return f"<table id='ctl00_ContentPlaceHolder5_ruralDataGrid'>{table_html}</table>"
+    
     def scrape_data(self, district, year, taluka, village, area_value):
         """
         Scrape data for given district, year, taluka, village and area value
@@ -113,85 +246,35 @@ class IGRScraper:
             dict: Contains rate_hectares, rate_sqm, and range info
         """
         try:
-            if not self.page:
-                self.start_browser()
-            
-            # Navigate to the website with district parameter
-            url = f"{self.base_url}{district}"
-            print(f"Navigating to: {url}")
-            self.page.goto(url, wait_until='domcontentloaded')
-            
-            # Select Year from dropdown
-            print(f"Selecting year: {year}")
-            self.page.wait_for_selector('#ctl00_ContentPlaceHolder5_ddlYear', timeout=15000)
-            self.page.select_option('#ctl00_ContentPlaceHolder5_ddlYear', label=year)
-            time.sleep(2)
-            self.page.wait_for_load_state('networkidle')
-            
-            # Select Taluka from dropdown
-            print(f"Selecting taluka: {taluka}")
-            self.page.wait_for_selector('#ctl00_ContentPlaceHolder5_ddlTaluka', timeout=15000)
-            self.page.select_option('#ctl00_ContentPlaceHolder5_ddlTaluka', label=taluka)
-            
-            # Wait for village dropdown to populate after taluka selection
-            time.sleep(3)
-            self.page.wait_for_load_state('networkidle')
-            
-            # Select Village from dropdown
-            print(f"Selecting village: {village}")
-            self.page.wait_for_selector('#ctl00_ContentPlaceHolder5_ddlVillage', timeout=15000)
-            
-            # Wait for village options to be available
-            self.page.wait_for_function(
-                "document.querySelector('#ctl00_ContentPlaceHolder5_ddlVillage').options.length > 1",
-                timeout=10000
-            )
-            
-            self.page.select_option('#ctl00_ContentPlaceHolder5_ddlVillage', label=village)
-            time.sleep(2)
-            self.page.wait_for_load_state('networkidle')
-            
-            # Wait for table to appear and extract HTML
-            print("Waiting for table to load...")
-            self.page.wait_for_selector('#ctl00_ContentPlaceHolder5_ruralDataGrid', timeout=15000)
-            
-            # Get the HTML of the specific table
-            table_html = self.page.locator('#ctl00_ContentPlaceHolder5_ruralDataGrid').inner_html()
-            print("Table HTML extracted successfully!")
-            
-            full_table_html = f"<table id='ctl00_ContentPlaceHolder5_ruralDataGrid'>{table_html}</table>"
+            cache_key = (district, year, taluka, village)
+            full_table_html = rate_table_cache.get(cache_key)
+            if full_table_html is None:
+                full_table_html = self.fetch_table_html(district, year, taluka, village)
             
             # Parse the table to find matching rate
-            soup = BeautifulSoup(full_table_html, 'html.parser')
-            table = soup.find('table', {'id': 'ctl00_ContentPlaceHolder5_ruralDataGrid'})
+            table = rate_table(full_table_html)
             
-            if not table:
+            if table is None:
                 return {"error": "Could not find the rate table"}
+            rate_table_cache.put(cache_key, full_table_html)
             
-            rows = table.find_all('tr')[1:]  # Skip header row
-            
-            for row in rows:
-                cells = row.find_all('td')
-                if len(cells) >= 3:
-                    assessment_range = cells[1].get_text().strip()
-                    rate_hectares = cells[2].get_text().strip()
+            match = lookup_rate(table, area_value)
+            if match:
+                assessment_range, rate_hectares = match
+                # Convert rate from hectares to square meters
+                # 1 hectare = 10,000 square meters
+                try:
+                    rate_per_hectare = float(rate_hectares)
+                    rate_per_sqm = rate_per_hectare / 10000
                     
-                    # Parse the range and check if area_value fits
-                    if self.is_value_in_range(area_value, assessment_range):
-                        # Convert rate from hectares to square meters
-                        # 1 hectare = 10,000 square meters
-                        try:
-                            rate_per_hectare = float(rate_hectares)
-                            rate_per_sqm = rate_per_hectare / 10000
-                            
-                            return {
-                                "range": assessment_range,
-                                "rate_hectares": rate_per_hectare,
-                                "rate_sqm": rate_per_sqm,
-                                "area_value": area_value
-                            }
-                        except ValueError:
-                            return {"error": f"Could not convert rate to number: {rate_hectares}"}
+                    return {
+                        "range": assessment_range,
+                        "rate_hectares": rate_per_hectare,
+                        "rate_sqm": rate_per_sqm,
+                        "area_value": area_value
+                    }
+                except ValueError:
+                    return {"error": f"Could not convert rate to number: {rate_hectares}"}
             
             return {"error": f"No matching range found for area value: {area_value}"}
             
@@ -200,10 +283,19 @@ class IGRScraper:
             return {"error": str(e)}
     
     def close_browser(self):
-        """Close only the page, keep browser running"""
-        if self.page:
-            self.page.close()
+        """Close the page and hand the browser back to the pool"""
+        reusable = True
+        try:
+            if self.page:
+                self.page.close()
+        except Exception:
+            reusable = False
+        finally:
             self.page = None
+            if self.browser:
+                _browser_pool.release(self.playwright, self.browser, self.headless, 0, reusable=reusable)
+            self.browser = None
+            self.playwright = None
     
 
 def get_land_rate(district, year, taluka, village, area_value):